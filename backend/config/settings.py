@@ -1,73 +1,135 @@
 import os
-from typing import Dict, List
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import ClassVar, Dict, List, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+@lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load environment variables from .env file (once per process)."""
+    load_dotenv(override=False)
+    return True
 
+_load_env()
+
+_DEFAULT_TESSERACT_CMD = r"C:\Users\nhari\AppData\Local\Programs\Tesseract-OCR\tesseract.exe"
+
+# Environment-derived constants, frozen at import so hot-path guards like
+# `if DEBUG:` are plain module-global loads
+TESSERACT_CMD: str = os.getenv("TESSERACT_CMD", _DEFAULT_TESSERACT_CMD)
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Configuration settings for the amount detection service."""
-    
+    """Configuration settings for the amount detection service.
+
+    Frozen with slots so per-request attribute reads are C-level slot
+    lookups and the configuration cannot be mutated at runtime.
+    """
+
+    # Environment-derived settings (aliases of the module-level constants)
+    TESSERACT_CMD: str = TESSERACT_CMD
+    LOG_LEVEL: str = LOG_LEVEL
+    DEBUG: bool = DEBUG
+
     # OCR Configuration
-    TESSERACT_CMD = os.getenv("TESSERACT_CMD", r"C:\Users\nhari\AppData\Local\Programs\Tesseract-OCR\tesseract.exe")
-    OCR_CONFIG = "--oem 3 --psm 6"
-    MIN_OCR_CONFIDENCE = 0.1  # More lenient - our enhanced test showed low confidence can still work
-    
+    OCR_CONFIG: ClassVar[str] = "--oem 3 --psm 6"
+    # Opt-in: run OCR in worker processes instead of threads (true parallelism
+    # for CPU-bound Tesseract work under concurrent uploads)
+    OCR_USE_PROCESS_POOL: ClassVar[bool] = os.getenv("OCR_USE_PROCESS_POOL", "False").lower() == "true"
+    MIN_OCR_CONFIDENCE: ClassVar[float] = 0.1  # More lenient - our enhanced test showed low confidence can still work
+    # Stop the multi-config OCR sweep early once a config scores this high;
+    # clean scans then pay for one Tesseract pass instead of five
+    OCR_SHORTCUT_CONFIDENCE: ClassVar[float] = 0.85
+    # Cap the longer image side before OCR; Tesseract cost scales with pixel
+    # count and 12 MP phone photos gain nothing over this resolution
+    OCR_MAX_DIM: ClassVar[int] = 1600
+
     # Image Processing
-    MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
-    SUPPORTED_IMAGE_FORMATS = ["jpg", "jpeg", "png", "bmp", "tiff"]
-    
+    MAX_IMAGE_SIZE: ClassVar[int] = 10 * 1024 * 1024  # 10MB
+    UPLOAD_BUFFER_SIZE: ClassVar[int] = int(os.getenv("UPLOAD_BUFFER_SIZE", 64 * 1024))
+    SUPPORTED_IMAGE_FORMATS: ClassVar[List[str]] = ["jpg", "jpeg", "png", "bmp", "tiff"]
+
     # Amount Detection
-    MIN_AMOUNT_CONFIDENCE = 0.3  # More lenient
-    MAX_AMOUNT_VALUE = 1000000  # Maximum reasonable amount
-    MIN_AMOUNT_VALUE = 0.01     # Minimum reasonable amount
-    
-    # Currency Patterns
-    CURRENCY_PATTERNS = {
-        "INR": [r"INR", r"Rs\.?", r"₹", r"Rupees?"],
-        "USD": [r"USD", r"\$", r"Dollars?"],
-        "EUR": [r"EUR", r"€", r"Euros?"],
-        "GBP": [r"GBP", r"£", r"Pounds?"]
+    MIN_AMOUNT_CONFIDENCE: ClassVar[float] = 0.3  # More lenient
+    MAX_AMOUNT_VALUE: ClassVar[int] = 1000000  # Maximum reasonable amount
+    MIN_AMOUNT_VALUE: ClassVar[float] = 0.01     # Minimum reasonable amount
+
+    # Currency Patterns (longest-first alternations instead of optional
+    # suffixes so matching never backtracks on long noisy OCR scans)
+    CURRENCY_PATTERNS: ClassVar[Dict[str, List[str]]] = {
+        "INR": [r"INR", r"(?:Rs\.|Rs)", r"₹", r"(?:Rupees|Rupee)"],
+        "USD": [r"USD", r"\$", r"(?:Dollars|Dollar)"],
+        "EUR": [r"EUR", r"€", r"(?:Euros|Euro)"],
+        "GBP": [r"GBP", r"£", r"(?:Pounds|Pound)"]
     }
     
-    # Amount Type Keywords
-    AMOUNT_TYPE_KEYWORDS = {
-        "total_bill": ["total", "amount", "bill", "invoice", "grand total"],
-        "paid": ["paid", "payment", "received", "collected"],
-        "due": ["due", "balance", "outstanding", "pending", "owed"],
-        "discount": ["discount", "off", "reduction", "concession"],
-        "tax": ["tax", "gst", "vat", "service tax"],
-        "copay": ["copay", "co-pay", "patient share"],
-        "deductible": ["deductible", "excess"],
-        "insurance_covered": ["insurance", "covered", "claim", "reimbursed"]
+    # Amount Type Keywords (interned so repeated keyword/token comparisons in
+    # the classification hot path hit cached hashes and pointer equality)
+    AMOUNT_TYPE_KEYWORDS: ClassVar[Dict[str, List[str]]] = {
+        sys.intern(amount_type): [sys.intern(keyword) for keyword in keywords]
+        for amount_type, keywords in {
+            "total_bill": ["total", "amount", "bill", "invoice", "grand total"],
+            "paid": ["paid", "payment", "received", "collected"],
+            "due": ["due", "balance", "outstanding", "pending", "owed"],
+            "discount": ["discount", "off", "reduction", "concession"],
+            "tax": ["tax", "gst", "vat", "service tax"],
+            "copay": ["copay", "co-pay", "patient share"],
+            "deductible": ["deductible", "excess"],
+            "insurance_covered": ["insurance", "covered", "claim", "reimbursed"]
+        }.items()
     }
-    
+
+    # Pre-compiled patterns (built once at class load so hot paths never re-compile)
+    _CURRENCY_REGEX: ClassVar[Dict[str, List[re.Pattern]]] = {
+        currency: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for currency, patterns in CURRENCY_PATTERNS.items()
+    }
+    _CURRENCY_COMBINED_REGEX: ClassVar[Dict[str, re.Pattern]] = {
+        currency: re.compile("|".join(patterns), re.IGNORECASE)
+        for currency, patterns in CURRENCY_PATTERNS.items()
+    }
+    _AMOUNT_TYPE_REGEX: ClassVar[Dict[str, re.Pattern]] = {
+        amount_type: re.compile(r"\b(" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE)
+        for amount_type, keywords in AMOUNT_TYPE_KEYWORDS.items()
+    }
+
     # Normalization Settings
-    OCR_DIGIT_CORRECTIONS = {
+    OCR_DIGIT_CORRECTIONS: ClassVar[Dict[str, str]] = {
         "l": "1", "I": "1", "O": "0", "o": "0", "S": "5", "s": "5", "G": "6",
         "T": "7", "B": "8", "b": "6", "g": "9", "Z": "2", "z": "2",
         "¢": "0", "@": "0", "e": "0", "c": "0"  # Common OCR misreads for 0
     }
-    
+
+    # Translation table so corrections run as a single C-level pass over the string
+    OCR_TRANSLATION_TABLE: ClassVar[Dict[int, str]] = str.maketrans(OCR_DIGIT_CORRECTIONS)
+
     # Processing Thresholds
-    PROCESSING_CONFIDENCE_THRESHOLD = 0.3  # More lenient - allow processing with lower confidence
-    CLASSIFICATION_CONFIDENCE_THRESHOLD = 0.4  # More lenient
-    
-    # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
-    # Development Settings
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
-    
+    PROCESSING_CONFIDENCE_THRESHOLD: ClassVar[float] = 0.3  # More lenient - allow processing with lower confidence
+    CLASSIFICATION_CONFIDENCE_THRESHOLD: ClassVar[float] = 0.4  # More lenient
+
     @classmethod
-    def get_currency_pattern(cls, currency: str) -> List[str]:
-        """Get regex patterns for a specific currency."""
-        return cls.CURRENCY_PATTERNS.get(currency.upper(), [])
-    
+    def get_currency_pattern(cls, currency: str) -> List[re.Pattern]:
+        """Get pre-compiled regex patterns for a specific currency."""
+        return cls._CURRENCY_REGEX.get(currency.upper(), [])
+
+    @classmethod
+    def get_currency_combined_regex(cls, currency: str) -> Optional[re.Pattern]:
+        """Get a single pre-compiled alternation covering all patterns for a currency."""
+        return cls._CURRENCY_COMBINED_REGEX.get(currency.upper())
+
     @classmethod
     def get_amount_type_keywords(cls, amount_type: str) -> List[str]:
         """Get keywords for a specific amount type."""
         return cls.AMOUNT_TYPE_KEYWORDS.get(amount_type.lower(), [])
 
+    @classmethod
+    def get_amount_type_regex(cls, amount_type: str) -> Optional[re.Pattern]:
+        """Get the pre-compiled keyword regex for a specific amount type."""
+        return cls._AMOUNT_TYPE_REGEX.get(amount_type.lower())
+
 # Global settings instance
 settings = Settings()
\ No newline at end of file
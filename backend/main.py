@@ -1,31 +1,23 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
-from typing import List, Any
+from typing import Optional
 import logging
+import os
+from functools import lru_cache
+import orjson
+from models.request_models import CleanProcessingResponse
 from services.pipeline_service import AmountDetectionPipeline
 from services.direct_extraction_service import DirectExtractionService
 from services.ocr_service import OCRService
+from config.settings import settings
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (level comes from the LOG_LEVEL env var)
+logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
-# Define validation error models for OpenAPI schema
-class ValidationError(BaseModel):
-    """Validation error model for OpenAPI schema"""
-    loc: List[str] = Field(..., description="Error location")
-    msg: str = Field(..., description="Error message")
-    type: str = Field(..., description="Error type")
-    input: Any = Field(None, description="Input that caused the error")
-
-class HTTPValidationError(BaseModel):
-    """HTTP validation error model for OpenAPI schema"""
-    detail: List[ValidationError] = Field(..., description="List of validation errors")
-
 app = FastAPI(
     title="AI Medical Bill Analyzer",
     description="""
@@ -53,6 +45,8 @@ app = FastAPI(
     license_info={
         "name": "MIT License",
     },
+    openapi_url=None,  # Served below from a pre-serialized bytes cache
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -64,309 +58,104 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the processing pipeline
-pipeline = AmountDetectionPipeline()
+# Lazy pipeline singleton: constructed on first use rather than at import,
+# keeping module import (and uvicorn --reload cycles) cheap
+@lru_cache(maxsize=1)
+def get_pipeline() -> AmountDetectionPipeline:
+    return AmountDetectionPipeline()
+
+# O(1) membership check matching SUPPORTED_IMAGE_FORMATS; tighter than the
+# old startswith('image/') prefix test, which accepted any image/* subtype
+_ALLOWED_CONTENT_TYPES = frozenset({
+    "image/png", "image/jpeg", "image/jpg", "image/bmp", "image/tiff"
+})
+
+async def _read_upload(file: UploadFile) -> memoryview:
+    """
+    Read an upload in UPLOAD_BUFFER_SIZE chunks into one growable buffer.
 
-# Custom OpenAPI schema to hide unwanted endpoints and schemas
+    Avoids materializing a second full-size bytes copy on top of Starlette's
+    spooled file; the returned memoryview goes to the pipeline zero-copy.
+    """
+    buffer = bytearray()
+    chunk_size = settings.UPLOAD_BUFFER_SIZE
+    while chunk := await file.read(chunk_size):
+        buffer.extend(chunk)
+    return memoryview(buffer)
+
+# Custom OpenAPI schema to hide unwanted endpoints and schemas.
+# Built once: the dict is cached on app.openapi_schema and the serialized
+# bytes are cached so /openapi.json responses never re-walk routes or
+# re-encode after the first hit.
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
-    
+
     openapi_schema = get_openapi(
-        title="AI Medical Bill Analyzer",
-        version="2.0.0",
+        title=app.title,
+        version=app.version,
         description=app.description,
         routes=app.routes,
     )
-    
-    # Remove unwanted schemas from the documentation
+
+    # Keep only essential schemas, remove internal ones
     if "components" in openapi_schema and "schemas" in openapi_schema["components"]:
-        # Keep only essential schemas, remove internal ones
-        schemas_to_keep = {}
-        for schema_name, schema_content in openapi_schema["components"]["schemas"].items():
-            if not schema_name.startswith("HTTPValidation") and not schema_name.startswith("ValidationError"):
-                schemas_to_keep[schema_name] = schema_content
-        openapi_schema["components"]["schemas"] = schemas_to_keep
-    
+        openapi_schema["components"]["schemas"] = {
+            schema_name: schema_content
+            for schema_name, schema_content in openapi_schema["components"]["schemas"].items()
+            if not schema_name.startswith("HTTPValidation") and not schema_name.startswith("ValidationError")
+        }
+
     # Remove internal paths we don't want to show
-    paths_to_remove = []
-    for path in openapi_schema.get("paths", {}):
-        if path in ["/", "/health"]:
-            paths_to_remove.append(path)
-    
-    for path in paths_to_remove:
-        if path in openapi_schema["paths"]:
-            del openapi_schema["paths"][path]
-    
+    for path in ["/", "/health"]:
+        openapi_schema.get("paths", {}).pop(path, None)
+
     app.openapi_schema = openapi_schema
     return app.openapi_schema
 
 app.openapi = custom_openapi
 
-# Custom Swagger UI with beautiful styling
-@app.get("/docs", include_in_schema=False)
-async def custom_swagger_ui_html():
-    return HTMLResponse("""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>AI Medical Bill Analyzer</title>
-        <link rel="stylesheet" type="text/css" href="https://unpkg.com/swagger-ui-dist@3.52.5/swagger-ui.css" />
-        <link rel="icon" type="image/png" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>+</text></svg>" />
-        <style>
-            /* Custom beautiful styling */
-            body {
-                margin: 0;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }
-            
-            .swagger-ui {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            }
-            
-            .swagger-ui .topbar {
-                background: linear-gradient(135deg, #4CAF50, #45a049);
-                padding: 20px 0;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            
-            .swagger-ui .topbar .download-url-wrapper {
-                display: none;
-            }
-            
-            .swagger-ui .info {
-                background: white;
-                padding: 30px;
-                border-radius: 15px;
-                box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-                margin: 20px;
-            }
-            
-            .swagger-ui .info .title {
-                color: #2c3e50;
-                font-size: 2.5em;
-                font-weight: 700;
-                margin-bottom: 10px;
-                text-align: center;
-            }
-            
-            .swagger-ui .info .description {
-                color: #555;
-                font-size: 1.1em;
-                line-height: 1.6;
-            }
-            
-            .swagger-ui .scheme-container {
-                background: white;
-                border-radius: 10px;
-                box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-                margin: 20px;
-                padding: 20px;
-            }
-            
-            .swagger-ui .opblock {
-                border-radius: 10px;
-                box-shadow: 0 4px 16px rgba(0,0,0,0.05);
-                margin: 20px;
-                border: none;
-                overflow: hidden;
-            }
-            
-            .swagger-ui .opblock.opblock-post {
-                background: linear-gradient(135deg, #ff6b6b, #ee5a24);
-                border-left: 5px solid #c0392b;
-            }
-            
-            .swagger-ui .opblock .opblock-summary {
-                padding: 20px;
-            }
-            
-            .swagger-ui .opblock .opblock-summary-method {
-                background: rgba(255,255,255,0.2);
-                color: white;
-                font-weight: bold;
-                border-radius: 8px;
-                padding: 8px 12px;
-                text-transform: uppercase;
-                font-size: 0.9em;
-            }
-            
-            .swagger-ui .opblock .opblock-summary-path {
-                color: white;
-                font-weight: 600;
-                font-size: 1.1em;
-            }
-            
-            .swagger-ui .opblock .opblock-description-wrapper,
-            .swagger-ui .opblock .opblock-external-docs-wrapper,
-            .swagger-ui .opblock .opblock-title_normal {
-                color: white;
-            }
-            
-            .swagger-ui .btn.execute {
-                background: linear-gradient(135deg, #27ae60, #2ecc71);
-                border: none;
-                padding: 12px 24px;
-                border-radius: 8px;
-                color: white;
-                font-weight: 600;
-                font-size: 1.1em;
-                transition: all 0.3s ease;
-            }
-            
-            .swagger-ui .btn.execute:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(39, 174, 96, 0.4);
-            }
-            
-            .swagger-ui .response-content-type {
-                color: #27ae60;
-                font-weight: 600;
-            }
-            
-            .swagger-ui .responses-inner h4 {
-                color: #2c3e50;
-                font-size: 1.2em;
-            }
-            
-            .swagger-ui .parameter__name {
-                color: #e74c3c;
-                font-weight: 600;
-            }
-            
-            .swagger-ui .parameter__type {
-                color: #8e44ad;
-                font-weight: 500;
-            }
-            
-            /* File upload styling */
-            .swagger-ui .file-upload {
-                border: 2px dashed #3498db;
-                border-radius: 10px;
-                padding: 20px;
-                background: rgba(52, 152, 219, 0.1);
-                transition: all 0.3s ease;
-            }
-            
-            .swagger-ui .file-upload:hover {
-                border-color: #2980b9;
-                background: rgba(52, 152, 219, 0.2);
-            }
-            
-            /* Response styling */
-            .swagger-ui .responses-table {
-                border-radius: 10px;
-                overflow: hidden;
-                box-shadow: 0 4px 16px rgba(0,0,0,0.1);
-            }
-            
-            .swagger-ui .response.highlighted {
-                background: linear-gradient(135deg, #d4edda, #c3e6cb);
-                border: 1px solid #27ae60;
-            }
-            
-            /* Loading animation */
-            .swagger-ui .loading-container {
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                padding: 40px;
-            }
-            
-            .swagger-ui .loading-container .loading {
-                width: 40px;
-                height: 40px;
-                border: 4px solid #f3f3f3;
-                border-top: 4px solid #3498db;
-                border-radius: 50%;
-                animation: spin 1s linear infinite;
-            }
-            
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-            
-            /* Success/Error alerts */
-            .swagger-ui .response-content-type.success {
-                color: #27ae60;
-                font-weight: bold;
-            }
-            
-            .swagger-ui .response-content-type.error {
-                color: #e74c3c;
-                font-weight: bold;
-            }
-        </style>
-    </head>
-    <body>
-        <div id="swagger-ui"></div>
-        <script src="https://unpkg.com/swagger-ui-dist@3.52.5/swagger-ui-bundle.js"></script>
-        <script src="https://unpkg.com/swagger-ui-dist@3.52.5/swagger-ui-standalone-preset.js"></script>
-        <script>
-        window.onload = function() {
-            const ui = SwaggerUIBundle({
-                url: '/openapi.json',
-                dom_id: '#swagger-ui',
-                deepLinking: true,
-                presets: [
-                    SwaggerUIBundle.presets.apis,
-                    SwaggerUIStandalonePreset
-                ],
-                plugins: [
-                    SwaggerUIBundle.plugins.DownloadUrl
-                ],
-                layout: "StandaloneLayout",
-                validatorUrl: null,
-                tryItOutEnabled: true,
-                supportedSubmitMethods: ['get', 'post', 'put', 'delete', 'patch'],
-                onComplete: function() {
-                    // Add custom functionality after UI loads
-                    console.log('AI Medical Bill Analyzer Ready!');
-                    
-                    // Add welcome message
-                    const infoSection = document.querySelector('.swagger-ui .info');
-                    if (infoSection) {
-                        const welcomeDiv = document.createElement('div');
-                        welcomeDiv.innerHTML = `
-                            <div style="background: linear-gradient(135deg, #4CAF50, #45a049); color: white; padding: 20px; border-radius: 10px; margin: 20px 0; text-align: center;">
-                                <h3 style="margin: 0; font-size: 1.3em;">Welcome to AI Medical Bill Analyzer!</h3>
-                                <p style="margin: 10px 0 0 0; opacity: 0.9;">Upload your medical bill and get instant, accurate amount extraction</p>
-                            </div>
-                        `;
-                        infoSection.appendChild(welcomeDiv);
-                    }
-                }
-            });
-        }
-        </script>
-    </body>
-    </html>
-    """)
+_openapi_bytes: Optional[bytes] = None
+
+def _serialized_openapi() -> bytes:
+    global _openapi_bytes
+    if _openapi_bytes is None:
+        _openapi_bytes = orjson.dumps(custom_openapi())
+    return _openapi_bytes
+
+@app.on_event("startup")
+async def _warm_openapi():
+    # Build and serialize the schema during boot so the first /docs viewer
+    # does not pay the route-walking cost
+    _serialized_openapi()
 
-# Hide redoc as well
-@app.get("/redoc", include_in_schema=False)
-async def redoc_html():
-    return HTMLResponse("""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Redirecting...</title>
-        <script>
-            window.location.href = '/docs';
-        </script>
-    </head>
-    <body>
-        <p>Redirecting to main documentation...</p>
-    </body>
-    </html>
-    """)
+@app.on_event("startup")
+async def _warm_hot_paths():
+    # Regex patterns all compile at import time, but the pipeline singleton
+    # and the memoized extraction helpers are built lazily; run one sample
+    # line through both extraction paths so the first real request does not
+    # pay for that setup
+    sample = "Total: 1200 | Paid: 1000 | Due: 200"
+    await get_pipeline().process_text(sample)
+    direct_extraction_service.extract_with_fallback(sample)
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json():
+    return Response(content=_serialized_openapi(), media_type="application/json")
+
+# The Swagger and redoc pages are static HTML committed under static/;
+# StaticFiles serves them with sendfile and built-in ETag/Last-Modified
+# handling, skipping FastAPI's dependency-resolution stack entirely.
+_STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+app.mount("/docs", StaticFiles(directory=os.path.join(_STATIC_DIR, "docs"), html=True), name="docs")
+app.mount("/redoc", StaticFiles(directory=os.path.join(_STATIC_DIR, "redoc"), html=True), name="redoc")
 
 @app.post("/extract-amounts-text", 
           summary="Extract Amounts from Text",
           description="Parse medical bill text and extract financial amounts with smart categorization.",
           response_description="Returns currency, amounts array with types, and processing status",
+          response_model=CleanProcessingResponse,
+          response_class=ORJSONResponse,
           tags=["Amount Extraction"])
 async def extract_amounts_from_text(text: str = Body(..., media_type="text/plain", description="Raw medical bill text to process")):
     """
@@ -409,24 +198,16 @@ async def extract_amounts_from_text(text: str = Body(..., media_type="text/plain
     - Multiple currencies (INR, USD, EUR, GBP)
     """
     try:
-        logger.info(f"Processing text input: {text[:100]}...")
-        result = await pipeline.process_text(text)
-        
-        # Convert to clean format
-        clean_response = {
-            "currency": result.currency or "INR",
-            "amounts": [
-                {
-                    "type": amount.type,
-                    "value": amount.value,
-                    "source": amount.source
-                }
-                for amount in result.amounts
-            ],
-            "status": result.status
-        }
-        
-        return clean_response
+        logger.info("Processing text input: %.100s...", text)
+        result = await get_pipeline().process_text(text)
+
+        # The pipeline already holds AmountItem instances; wrap them once
+        # instead of rebuilding a dict per amount
+        return CleanProcessingResponse(
+            currency=result.currency or "INR",
+            amounts=result.amounts,
+            status=result.status
+        )
     except Exception as e:
         logger.error(f"Error processing text: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
@@ -435,6 +216,8 @@ async def extract_amounts_from_text(text: str = Body(..., media_type="text/plain
           summary="Extract Amounts from Medical Bill Image", 
           description="Upload a medical bill image and get instant amount extraction with AI-powered OCR.",
           response_description="Returns detected currency, categorized amounts, and processing status",
+          response_model=CleanProcessingResponse,
+          response_class=ORJSONResponse,
           tags=["Amount Extraction"])
 async def extract_amounts_from_image(
     file: UploadFile = File(
@@ -479,33 +262,25 @@ async def extract_amounts_from_image(
     """
     try:
         # Validate file type
-        if not file.content_type or not file.content_type.startswith('image/'):
+        if file.content_type not in _ALLOWED_CONTENT_TYPES:
             raise HTTPException(status_code=400, detail="Invalid file type. Please upload an image.")
         
-        logger.info(f"Processing image: {file.filename}")
-        
-        # Read image data
-        image_data = await file.read()
+        logger.info("Processing image: %s", file.filename)
         
+        # Read image data in chunks
+        image_data = await _read_upload(file)
+
         # Process through pipeline
-        result = await pipeline.process_image(image_data)
-        
-        # Convert to clean format
-        clean_response = {
-            "currency": result.currency or "INR",
-            "amounts": [
-                {
-                    "type": amount.type,
-                    "value": amount.value,
-                    "source": amount.source
-                }
-                for amount in result.amounts
-            ],
-            "status": result.status
-        }
-        
-        return clean_response
-        
+        result = await get_pipeline().process_image(image_data)
+
+        # The pipeline already holds AmountItem instances; wrap them once
+        # instead of rebuilding a dict per amount
+        return CleanProcessingResponse(
+            currency=result.currency or "INR",
+            amounts=result.amounts,
+            status=result.status
+        )
+
     except HTTPException:
         raise
     except Exception as e:
@@ -533,13 +308,13 @@ async def extract_bill_direct(file: UploadFile = File(...)):
     """Direct extraction endpoint - extract amounts from medical bill image."""
     try:
         # Debug: Log what we received
-        logger.info(f"=== DEBUG: Received request ===")
-        logger.info(f"File object: {file}")
-        logger.info(f"File type: {type(file)}")
+        logger.info("=== DEBUG: Received request ===")
+        logger.info("File object: %s", file)
+        logger.info("File type: %s", type(file))
         if file:
-            logger.info(f"File filename: {file.filename}")
-            logger.info(f"File content_type: {file.content_type}")
-            logger.info(f"File size (if available): {getattr(file, 'size', 'Unknown')}")
+            logger.info("File filename: %s", file.filename)
+            logger.info("File content_type: %s", file.content_type)
+            logger.info("File size (if available): %s", getattr(file, 'size', 'Unknown'))
         else:
             logger.error("File is None or missing!")
         
@@ -561,15 +336,15 @@ async def extract_bill_direct(file: UploadFile = File(...)):
             )
         
         # Validate file type
-        if not file.content_type or not file.content_type.startswith('image/'):
+        if file.content_type not in _ALLOWED_CONTENT_TYPES:
             raise HTTPException(
-                status_code=400, 
+                status_code=400,
                 detail=f"Invalid file type: {file.content_type}. Please upload an image file (PNG, JPG, etc.)"
             )
         
-        # Read image data
-        image_data = await file.read()
-        
+        # Read image data in chunks
+        image_data = await _read_upload(file)
+
         # Check if file is empty
         if not image_data:
             raise HTTPException(
@@ -577,7 +352,7 @@ async def extract_bill_direct(file: UploadFile = File(...)):
                 detail="Uploaded file is empty. Please upload a valid image file."
             )
         
-        logger.info(f"Processing uploaded file: {file.filename} ({len(image_data)} bytes)")
+        logger.info("Processing uploaded file: %s (%d bytes)", file.filename, len(image_data))
         
         # Step 1: OCR extraction
         ocr_result = await direct_ocr_service.extract_from_image(image_data)
@@ -599,7 +374,7 @@ async def extract_bill_direct(file: UploadFile = File(...)):
         results["ocr_confidence"] = ocr_result.confidence
         results["raw_ocr_text"] = ocr_result.original_text
         
-        logger.info(f"Successfully extracted {len(extracted_amounts)} amounts from {file.filename}")
+        logger.info("Successfully extracted %d amounts from %s", len(extracted_amounts), file.filename)
         
         return results
         
@@ -632,7 +407,7 @@ async def extract_bill_from_text_direct(request: dict = Body(...)):
         results = direct_extraction_service.format_results(extracted_amounts)
         results["input_text"] = text
         
-        logger.info(f"Successfully extracted {len(extracted_amounts)} amounts from text")
+        logger.info("Successfully extracted %d amounts from text", len(extracted_amounts))
         
         return results
         
@@ -647,7 +422,7 @@ async def extract_bill_from_text_direct(request: dict = Body(...)):
 async def debug_upload(file: UploadFile = File(None)):
     """Debug endpoint to troubleshoot Postman uploads."""
     logger.info("=== DEBUG UPLOAD ENDPOINT ===")
-    logger.info(f"Received file: {file}")
+    logger.info("Received file: %s", file)
     
     if not file:
         return {
@@ -682,69 +457,6 @@ async def debug_upload(file: UploadFile = File(None)):
             "message": f"Error reading file: {str(e)}"
         }
 
-def custom_openapi():
-    """Custom OpenAPI schema with proper validation error models"""
-    if app.openapi_schema:
-        return app.openapi_schema
-    
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-    )
-    
-    # Add the HTTPValidationError schema to components
-    if "components" not in openapi_schema:
-        openapi_schema["components"] = {}
-    if "schemas" not in openapi_schema["components"]:
-        openapi_schema["components"]["schemas"] = {}
-    
-    # Add ValidationError schema
-    openapi_schema["components"]["schemas"]["ValidationError"] = {
-        "title": "ValidationError",
-        "required": ["loc", "msg", "type"],
-        "type": "object",
-        "properties": {
-            "loc": {
-                "title": "Location",
-                "type": "array",
-                "items": {"type": "string"}
-            },
-            "msg": {
-                "title": "Message",
-                "type": "string"
-            },
-            "type": {
-                "title": "Error Type",
-                "type": "string"
-            },
-            "input": {
-                "title": "Input",
-                "description": "Input that caused the error"
-            }
-        }
-    }
-    
-    # Add HTTPValidationError schema
-    openapi_schema["components"]["schemas"]["HTTPValidationError"] = {
-        "title": "HTTPValidationError",
-        "required": ["detail"],
-        "type": "object",
-        "properties": {
-            "detail": {
-                "title": "Detail",
-                "type": "array",
-                "items": {"$ref": "#/components/schemas/ValidationError"}
-            }
-        }
-    }
-    
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-app.openapi = custom_openapi
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -2,8 +2,12 @@ from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
-class AmountType(Enum):
-    """Types of amounts that can be detected in medical documents."""
+class AmountType(str, Enum):
+    """Types of amounts that can be detected in medical documents.
+
+    Inherits from str so members compare and serialize as plain strings in
+    hot classification code without a .value dereference.
+    """
     # Standard financial types
     TOTAL_BILL = "total_bill"
     PAID = "paid"
@@ -47,7 +51,7 @@ class Currency(Enum):
     GBP = "GBP"
     UNKNOWN = "UNKNOWN"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RawToken:
     """Raw token extracted from text/OCR."""
     text: str
@@ -55,7 +59,7 @@ class RawToken:
     confidence: float
     context: str  # Surrounding text for context
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NormalizedAmount:
     """Normalized amount after OCR correction."""
     original_text: str
@@ -63,7 +67,7 @@ class NormalizedAmount:
     confidence: float
     corrections_made: List[str]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClassifiedAmount:
     """Amount with classification and context."""
     amount: NormalizedAmount
@@ -72,7 +76,7 @@ class ClassifiedAmount:
     source_context: str
     position_in_text: int
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Internal result structure for pipeline processing."""
     raw_tokens: List[RawToken]
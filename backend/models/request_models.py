@@ -1,21 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 
-class TextRequest(BaseModel):
-    """Request model for text-based amount extraction."""
-    text: str
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "text": "Total: INR 1200 | Paid: 1000 | Due: 200 | Discount: 10%"
-            }
-        }
-
 class RawTokensResponse(BaseModel):
     """Response model for Step 1 - OCR/Text Extraction."""
     raw_tokens: List[str]
     currency_hint: Optional[str] = None
+    currency: Optional[str] = None  # Detected currency code (including "UNKNOWN")
+    currency_confidence: Optional[float] = None
     confidence: float
     status: str = "success"
     reason: Optional[str] = None
@@ -28,9 +19,15 @@ class NormalizationResponse(BaseModel):
 
 class AmountItem(BaseModel):
     """Individual amount with type and value."""
+    # type is rewritten during conflict resolution, so this stays unfrozen
+    model_config = ConfigDict(extra='ignore')
+
     type: str
     value: float
     source: Optional[str] = None
+    # Set when the total = paid + due relationship check confirms this amount;
+    # internal to classification, so excluded from serialized responses
+    relationship_verified: Optional[bool] = Field(default=None, exclude=True)
 
 class ClassificationResponse(BaseModel):
     """Response model for Step 3 - Classification."""
@@ -47,9 +44,10 @@ class ProcessingResponse(BaseModel):
     normalization_confidence: Optional[float] = None
     classification_confidence: Optional[float] = None
     reason: Optional[str] = None
-    
-    class Config:
-        schema_extra = {
+
+    model_config = ConfigDict(
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "currency": "INR",
                 "amounts": [
@@ -60,15 +58,18 @@ class ProcessingResponse(BaseModel):
                 "status": "ok"
             }
         }
+    )
 
 class CleanProcessingResponse(BaseModel):
     """Clean response model matching the exact desired output format."""
     currency: str
     amounts: List[AmountItem]
     status: str
-    
-    class Config:
-        schema_extra = {
+
+    model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "currency": "INR",
                 "amounts": [
@@ -78,4 +79,5 @@ class CleanProcessingResponse(BaseModel):
                 ],
                 "status": "ok"
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
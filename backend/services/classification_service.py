@@ -1,39 +1,395 @@
+import asyncio
 import logging
 import re
+import string
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from models.data_models import AmountType, ClassifiedAmount, NormalizedAmount
 from models.request_models import ClassificationResponse, AmountItem
 from utils.text_utils import text_processor
 from config.settings import settings
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional fast path
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Fixed patterns compiled once at import so hot paths never hit re.compile
+_KEYWORD_TOKEN_RE = re.compile(r'\b[\w\-]+\b')
+
+# Deletes punctuation in one C-level translate pass when cleaning matched
+# item descriptions
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# Generic service tiers for unclassified amounts; bisect over the thresholds
+# picks the label without chained comparisons
+_SERVICE_TIER_THRESHOLDS = (100, 500, 1000)
+_SERVICE_TIER_LABELS = ('basic_service', 'minor_service', 'standard_service', 'major_service')
+
+# Item patterns for _extract_item_name, one alternation per category.
+# Each category scans independently (a span can count toward several
+# categories) and ties between equal counts resolve in dict order
+_ITEM_PATTERNS: Dict[str, re.Pattern] = {
+    'consultation': re.compile(r'consultation|consult|doctor\s+fee|physician|visit'),
+    'x_ray': re.compile(r'x[-\s]?ray|xray|radiograph'),
+    'medicine': re.compile(r'medicine|medication|drugs?|pharma'),
+    'blood_test': re.compile(r'blood\s+test|lab\s+test|laboratory|blood'),
+    'scan': re.compile(r'ct\s+scan|scan|mri'),
+    'ultrasound': re.compile(r'ultrasound|sonography|sono'),
+    'surgery': re.compile(r'surgery|operation|procedure'),
+    'injection': re.compile(r'injection|vaccine|shot'),
+    'ecg': re.compile(r'ecg|ekg|electrocardiogram'),
+    'physiotherapy': re.compile(r'physiotherapy|physio|therapy|rehabilitation'),
+    'ambulance': re.compile(r'ambulance|transport'),
+    'room_charges': re.compile(r'room|bed|ward|accommodation|charges'),
+    'nursing': re.compile(r'nursing|nurse|care'),
+    'test': re.compile(r'test(?!\s+rs)|testing'),  # Avoid matching "Test Rs."
+}
+
+# Fallback alternation for medical/service-related words near an amount.
+# A single union regex scans the context once instead of 14 separate passes;
+# the numbered group names rank matches by category so earlier categories
+# still win over later ones regardless of where they sit in the text
+_MEDICAL_SERVICE_RE = re.compile(r'\b(?:'
+    r'(?P<m00>consultation|consult|doctor|physician|visit)'
+    r'|(?P<m01>x[-\s]?ray|xray|radiograph)'
+    r'|(?P<m02>medicine|medication|drugs?|pharma)'
+    r'|(?P<m03>blood|test|lab|laboratory)'
+    r'|(?P<m04>scan|ct|mri|ultrasound|sonography)'
+    r'|(?P<m05>surgery|operation|procedure)'
+    r'|(?P<m06>injection|vaccine|shot)'
+    r'|(?P<m07>ecg|ekg|electrocardiogram)'
+    r'|(?P<m08>physio|therapy|rehabilitation)'
+    r'|(?P<m09>ambulance|transport)'
+    r'|(?P<m10>room|bed|ward|accommodation)'
+    r'|(?P<m11>nursing|nurse|care)'
+    r'|(?P<m12>checkup|examination|exam)'
+    r'|(?P<m13>report|diagnostic|analysis)'
+    r')\b')
+
+# Currency prefixes used when building per-amount source snippets
+_CURRENCY_PREFIX_PATTERNS = [r'Rs\.?\s*', r'₹\s*', r'INR\s*', r'\$\s*']
+
+# Service names mapped to amount types for direct associations.
+# Financial terms first for precision about different kinds of "amount",
+# then medical services
+_SERVICE_MAPPINGS: Dict[str, str] = {
+    # Financial terms - be specific about different types of "amount"
+    'final amount': 'total_bill',
+    'grand total': 'total_bill',
+    'net amount': 'total_bill',
+    'total amount': 'total_bill',
+    'sub total': 'total_bill',
+    'subtotal': 'total_bill',
+    'amount paid': 'paid',
+    'paid amount': 'paid',
+    'payment': 'paid',
+    'amount due': 'due',
+    'due amount': 'due',
+    'balance': 'due',
+    'outstanding': 'due',
+    'discount': 'discount',
+    'concession': 'discount',
+    'tax': 'tax',
+    'gst': 'tax',
+    'vat': 'tax',
+    # Medical services
+    'consultation': 'consultation',
+    'consult': 'consultation',
+    'x-ray': 'x_ray',
+    'x ray': 'x_ray',
+    'xray': 'x_ray',
+    'medicine': 'medicine',
+    'medication': 'medicine',
+    'blood test': 'blood_test',
+    'blood': 'blood_test',
+    'ultrasound': 'ultrasound',
+    'scan': 'scan',
+    'injection': 'injection',
+    'ecg': 'ecg',
+    'nursing': 'nursing',
+    'physiotherapy': 'physiotherapy',
+    'physio': 'physiotherapy',
+    'mri': 'mri',
+    'ct scan': 'ct_scan',
+    'ct': 'ct_scan',
+    'pet scan': 'pet_scan',
+    'pet': 'pet_scan',
+    'endoscopy': 'endoscopy',
+    'biopsy': 'biopsy',
+    'surgery': 'surgery',
+    'operation': 'surgery',
+    'lab test': 'lab_test',
+    'laboratory': 'lab_test',
+    'pathology': 'pathology',
+    'radiology': 'radiology',
+    'total': 'total_bill',
+    'paid': 'paid',
+    'due': 'due',
+}
+
+# Keys checked longest-first so compound names ("total amount") win over
+# their substrings ("total")
+_SERVICE_KEYS_BY_LENGTH = sorted(_SERVICE_MAPPINGS, key=len, reverse=True)
+
+# Generic financial terms that should not be treated as medical services
+_FINANCIAL_TERMS = frozenset({'total', 'paid', 'due', 'discount', 'tax', 'amount', 'bill', 'balance'})
+
+
+def _build_service_automaton() -> Optional["ahocorasick.Automaton"]:
+    """Build an automaton over the service-mapping keys so a label is scanned
+    for all ~50 keys in one pass instead of one substring check per key."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for service_key in _SERVICE_MAPPINGS:
+        automaton.add_word(service_key, service_key)
+    automaton.make_automaton()
+    return automaton
+
+
+_SERVICE_AUTOMATON = _build_service_automaton()
+
+
+def _lookup_service_key(service_name: str) -> Optional[str]:
+    """Find the longest mapped service key contained in service_name."""
+    if _SERVICE_AUTOMATON is not None:
+        best_key = None
+        for _, service_key in _SERVICE_AUTOMATON.iter(service_name):
+            if best_key is None or len(service_key) > len(best_key):
+                best_key = service_key
+        return best_key
+    for service_key in _SERVICE_KEYS_BY_LENGTH:
+        if service_key in service_name:
+            return service_key
+    return None
+
+# Cheap one-pass "Label: Rs.Amount" scan; amounts found this way are already
+# resolved by the direct-association path and skip the full context search
+_QUICK_DIRECT_RE = re.compile(r'([A-Za-z][A-Za-z\s\-]{1,40}?)[:\s]+(?:Rs\.?|₹)\s*(\d+(?:\.\d+)?)')
+
+
+@lru_cache(maxsize=256)
+def _direct_association_regex(amount_str: str) -> re.Pattern:
+    """
+    Build the direct-association pattern ("Service: Rs.Amount", "Service
+    Rs.Amount", "Service ₹Amount") for one amount as a single alternation,
+    cached per amount string.
+    """
+    return re.compile(
+        r'([a-zA-Z][a-zA-Z\s\-]+?)(?::\s*Rs\.?|\s+Rs\.?|\s*₹)\s*' + re.escape(amount_str),
+        re.IGNORECASE,
+    )
+
+
+@lru_cache(maxsize=256)
+def _description_patterns(amount_str: str) -> Tuple[re.Pattern, ...]:
+    """
+    Compile the item-description patterns for one amount, cached per amount
+    string. Kept as separate patterns because their order is a priority
+    (colon beats dash beats bare space).
+    """
+    escaped_amount = re.escape(amount_str)
+    return (
+        re.compile(r'([a-zA-Z][a-zA-Z\s]+?):\s*Rs\.?\s*' + escaped_amount, re.IGNORECASE),
+        re.compile(r'([a-zA-Z][a-zA-Z\s]+?)\s*-\s*Rs\.?\s*' + escaped_amount, re.IGNORECASE),
+        re.compile(r'([a-zA-Z][a-zA-Z\s]+?)\s+Rs\.?\s*' + escaped_amount, re.IGNORECASE),
+        re.compile(r'([a-zA-Z][a-zA-Z\s]+?)\s*₹\s*' + escaped_amount, re.IGNORECASE),
+        # Pattern for "Amount: Rs.XXX Service" format
+        re.compile(r'Rs\.?\s*' + escaped_amount + r'\s+([a-zA-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    )
+
+
+@lru_cache(maxsize=256)
+def _word_before_amount_regex(amount_str: str) -> re.Pattern:
+    """Last-resort "Word Rs.Amount" pattern, cached per amount string."""
+    return re.compile(
+        r'\b([a-zA-Z]{3,})\s*:?\s*Rs\.?\s*' + re.escape(amount_str),
+        re.IGNORECASE,
+    )
+
+
+def _context_bounds(text: str, start: int, end: int, stops: str = '\n.|', limit: int = 40) -> Tuple[int, int]:
+    """
+    Find context boundaries around a match using C-level rfind/find scans.
+
+    Returns (left, right) such that text[left:right] extends from just after
+    the nearest stop character before the match to the nearest stop character
+    after it, bounded by ``limit`` characters on each side.
+    """
+    lo = max(0, start - limit - 1)
+    left = lo
+    for stop in stops:
+        pos = text.rfind(stop, lo, start)
+        if pos != -1 and pos + 1 > left:
+            left = pos + 1
+
+    hi = min(len(text), end + limit + 1)
+    right = hi
+    for stop in stops:
+        pos = text.find(stop, end, hi)
+        if pos != -1 and pos < right:
+            right = pos
+
+    return left, right
+
+
+# Literal variants searched for each amount, in the same priority order as the
+# old per-amount regex list ("Rs." / "₹" prefixed forms first, bare number last).
+# Percentage forms ride along in the same scan for the small-amount fallback.
+_AMOUNT_VARIANTS = ("rs.{0}", "rs. {0}", "₹{0}", "₹ {0}", "{0}")
+_BARE_VARIANT_IDX = len(_AMOUNT_VARIANTS) - 1
+_PCT_VARIANT_IDX = len(_AMOUNT_VARIANTS)
+
+
+@lru_cache(maxsize=256)
+def _build_amount_automaton(amount_strs: Tuple[str, ...]) -> "ahocorasick.Automaton":
+    """Build one automaton covering every amount literal, its currency-prefixed
+    forms, and its percentage forms."""
+    automaton = ahocorasick.Automaton()
+    for amount_str in amount_strs:
+        lowered = amount_str.lower()
+        for variant_idx, template in enumerate(_AMOUNT_VARIANTS):
+            automaton.add_word(template.format(lowered), (amount_str, variant_idx, len(template) - 3 + len(lowered)))
+        automaton.add_word(lowered + '%', (amount_str, _PCT_VARIANT_IDX, len(lowered) + 1))
+        if '.' not in lowered:
+            automaton.add_word(lowered + '.0%', (amount_str, _PCT_VARIANT_IDX, len(lowered) + 3))
+    automaton.make_automaton()
+    return automaton
+
+
+def _scan_amount_hits(
+    amount_strs: Tuple[str, ...],
+    search_text: str
+) -> Tuple[Dict[str, List[Tuple[int, int, bool]]], Dict[str, List[Tuple[int, int]]]]:
+    """
+    Find all amount occurrences in a single Aho-Corasick pass.
+
+    Returns two mappings keyed by amount_str: (start, end, has_currency)
+    hits for the currency/bare forms, ordered by variant priority then
+    position so downstream scoring sees candidates in the same order as the
+    old per-pattern regex scan, and (start, end) hits for percentage forms.
+    The lowered haystack preserves offsets, giving case-insensitive matching
+    for the "Rs." prefixes.
+    """
+    lowered_text = search_text.lower()
+    raw_hits: Dict[str, List[Tuple[int, int, int]]] = {}
+    pct_hits: Dict[str, List[Tuple[int, int]]] = {}
+
+    automaton = _build_amount_automaton(amount_strs)
+    for end_idx, (amount_str, variant_idx, length) in automaton.iter(lowered_text):
+        end = end_idx + 1
+        start = end - length
+
+        if variant_idx == _PCT_VARIANT_IDX:
+            pct_hits.setdefault(amount_str, []).append((start, end))
+            continue
+
+        # Enforce the word boundaries the regex patterns carried: no word
+        # character after the amount, and none before a bare-number match
+        if end < len(lowered_text) and (lowered_text[end].isalnum() or lowered_text[end] == '_'):
+            continue
+        if variant_idx == _BARE_VARIANT_IDX and start > 0 and (
+            lowered_text[start - 1].isalnum() or lowered_text[start - 1] == '_'
+        ):
+            continue
+
+        raw_hits.setdefault(amount_str, []).append((variant_idx, start, end))
+
+    return {
+        amount_str: [
+            (start, end, variant_idx != _BARE_VARIANT_IDX)
+            for variant_idx, start, end in sorted(hits)
+        ]
+        for amount_str, hits in raw_hits.items()
+    }, pct_hits
+
 class ClassificationService:
     """Service for classifying amounts based on context and keywords."""
     
     def __init__(self):
         self.amount_type_keywords = settings.AMOUNT_TYPE_KEYWORDS
         self.min_confidence = settings.CLASSIFICATION_CONFIDENCE_THRESHOLD
+        # Single-token keywords score via a token Counter lookup; multi-word
+        # keywords fall back to substring counting on the lowered text
+        self._single_keywords = {
+            amount_type: [kw for kw in keywords if ' ' not in kw]
+            for amount_type, keywords in self.amount_type_keywords.items()
+        }
+        self._multi_keywords = {
+            amount_type: [kw for kw in keywords if ' ' in kw]
+            for amount_type, keywords in self.amount_type_keywords.items()
+        }
+        # Fixed type layout so per-amount scoring uses a flat list indexed by
+        # type instead of allocating a dict of tuples per amount
+        self._type_names = tuple(self.amount_type_keywords)
+        self._type_index = {name: idx for idx, name in enumerate(self._type_names)}
+        # Inverted index: keyword token -> type indices containing it, so
+        # scoring walks the matched tokens once instead of looping every
+        # keyword for every type
+        self._keyword_type_index: Dict[str, List[int]] = {}
+        for amount_type, keywords in self._single_keywords.items():
+            type_idx = self._type_index[amount_type]
+            for keyword in keywords:
+                self._keyword_type_index.setdefault(keyword, []).append(type_idx)
     
     async def classify_amounts(
-        self, 
-        amounts: List[float], 
+        self,
+        amounts: List[float],
         original_text: str,
         currency_hint: Optional[str] = None,
         input_source: str = "text"
     ) -> ClassificationResponse:
         """
         Classify amounts based on surrounding context.
-        
+
         Args:
             amounts: List of normalized amounts
             original_text: Original text containing the amounts
             currency_hint: Detected currency hint
             input_source: Source of input ("text" or "image")
-            
+
         Returns:
             ClassificationResponse with classified amounts
         """
+        return self._classify_amounts_sync(amounts, original_text, currency_hint, input_source)
+
+    async def classify_batch(
+        self,
+        items: List[Tuple[List[float], str, Optional[str], str]]
+    ) -> List[ClassificationResponse]:
+        """
+        Classify several bills concurrently.
+
+        The CPU-bound classification for each bill is dispatched to worker
+        threads so multiple bills do not serialize behind the event loop.
+        Results come back in input order.
+
+        Args:
+            items: List of (amounts, original_text, currency_hint, input_source) tuples
+
+        Returns:
+            List of ClassificationResponse objects, one per item
+        """
+        if not items:
+            return []
+        return list(await asyncio.gather(*[
+            asyncio.to_thread(self._classify_amounts_sync, *item)
+            for item in items
+        ]))
+
+    def _classify_amounts_sync(
+        self,
+        amounts: List[float],
+        original_text: str,
+        currency_hint: Optional[str] = None,
+        input_source: str = "text"
+    ) -> ClassificationResponse:
+        """Synchronous classification body shared by the async entry points."""
         try:
             if not amounts:
                 return ClassificationResponse(
@@ -43,25 +399,46 @@ class ClassificationService:
             
             logger.info(f"Classifying {len(amounts)} amounts using text context")
             
-            # Clean text for analysis
+            # Clean text for analysis (lowered once here; the lowered forms are
+            # threaded through so no downstream step re-lowercases)
             cleaned_text = text_processor.clean_text(original_text.lower())
-            
+            cleaned_text_lower = cleaned_text.lower()
+
+            # Apply OCR corrections once here so context finding matches the
+            # corrected amounts without re-running the correction pass
+            corrected_text, _ = text_processor.correct_ocr_digits(original_text)
+
+            # String form of each amount, computed once and threaded through
+            # instead of re-deriving it in every sub-step
+            amount_strs = {
+                amount: str(int(amount)) if amount.is_integer() else str(amount)
+                for amount in amounts
+            }
+
+            # Cheap direct pass first: amounts already in unambiguous
+            # "Label: Rs.X" form skip the full per-amount context search
+            quick_hits = self._quick_direct_pass(corrected_text)
+            pending_amounts = [amount for amount in amounts if amount not in quick_hits]
+
             # Find amount contexts in text
-            amount_contexts = self._find_amount_contexts(amounts, original_text)
-            
+            amount_contexts = (
+                self._find_amount_contexts(pending_amounts, original_text, corrected_text, amount_strs)
+                if pending_amounts else {}
+            )
+
             # Classify each amount
             classified_amounts = []
             classification_confidences = []
-            
+
             for amount in amounts:
-                context = amount_contexts.get(amount, "")
-                amount_type, confidence, source_context = self._classify_single_amount(amount, context, cleaned_text)
-                
+                amount_str = amount_strs[amount]
+                context, _ = quick_hits.get(amount) or amount_contexts.get(amount, ("", 0))
+                amount_type, confidence, source_context = _classify_single_amount_cached(
+                    amount, amount_str, context, context.lower(), cleaned_text, cleaned_text_lower
+                )
+
                 # Extract item name from context or use the classified type
-                item_name = self._extract_item_name(amount, context, amount_type, source_context)
-                
-                # Debug logging
-                print(f"DEBUG: Amount {amount} -> Context: '{context}' -> Type: {amount_type.value} -> Item: {item_name}")
+                item_name = _extract_item_name_cached(amount, amount_str, context, amount_type, source_context)
                 
                 classified_amounts.append(AmountItem(
                     type=item_name,
@@ -70,7 +447,7 @@ class ClassificationService:
                 ))
                 
                 classification_confidences.append(confidence)
-                logger.debug(f"Classified {amount} as {item_name} with confidence {confidence:.2f}")
+                logger.debug("Classified %s as %s with confidence %.2f", amount, item_name, confidence)
             
             # Resolve conflicts and improve classifications (temporarily disabled to test)
             # classified_amounts = self._resolve_classification_conflicts(classified_amounts, original_text)
@@ -92,29 +469,49 @@ class ClassificationService:
                 confidence=0.0
             )
     
-    def _find_amount_contexts(self, amounts: List[float], text: str) -> Dict[float, str]:
+    def _quick_direct_pass(self, text: str) -> Dict[float, Tuple[str, int]]:
+        """
+        Find amounts in unambiguous "Label: Rs.Amount" form with one scan.
+
+        Args:
+            text: OCR-corrected text to scan
+
+        Returns:
+            Dictionary mapping each directly-labelled amount to its matched
+            snippet and offset (first occurrence wins)
+        """
+        hits: Dict[float, Tuple[str, int]] = {}
+        for match in _QUICK_DIRECT_RE.finditer(text):
+            value = float(match.group(2))
+            if value not in hits:
+                hits[value] = (match.group(0).strip(), match.start())
+        return hits
+
+    def _find_amount_contexts(
+        self,
+        amounts: List[float],
+        text: str,
+        corrected_text: str,
+        amount_strs: Dict[float, str]
+    ) -> Dict[float, Tuple[str, int]]:
         """
         Find context strings for each amount in the text.
-        
+
         Args:
             amounts: List of amounts to find contexts for
             text: Original text
-            
+            corrected_text: OCR-corrected copy of text (computed by the caller)
+            amount_strs: Pre-computed string form of each amount
+
         Returns:
-            Dictionary mapping amounts to their contexts
+            Dictionary mapping amounts to (context, match offset) pairs
         """
         amount_contexts = {}
-        
-        # Apply OCR corrections to the text to match the corrected amounts
-        from utils.text_utils import TextProcessor
-        text_processor = TextProcessor()
-        corrected_text, corrections = text_processor.correct_ocr_digits(text)
-        
+
         # Additional fix for percentage patterns (1% -> 10% in discount context)
         if 'discount' in corrected_text.lower() and '1%' in corrected_text:
             corrected_text = corrected_text.replace('1%', '10%')
-            corrections.append("Discount percentage: '1%' -> '10%'")
-        
+
         # Fix common OCR errors for field names
         corrected_text = corrected_text.replace('Du0:', 'Due:')
         corrected_text = corrected_text.replace('Tota1:', 'Total:')
@@ -122,98 +519,70 @@ class ClassificationService:
         # Use the corrected text for context detection
         search_text = corrected_text
         
-        for amount in amounts:
-            # Create patterns to find this amount in text with currency
-            # Use word boundaries to avoid partial matches (e.g., "10" in "1000")
-            amount_str = str(int(amount)) if amount.is_integer() else str(amount)
-            amount_patterns = [
-                f"Rs\\.{amount_str}\\b",
-                f"Rs\\. {amount_str}\\b", 
-                f"₹{amount_str}\\b",
-                f"₹ {amount_str}\\b",
-                f"\\b{amount_str}\\b",  # Add word boundaries to prevent partial matches
-            ]
-            
+        # Find every amount occurrence up front: one automaton pass over the
+        # text instead of five regex scans per amount
+        amount_str_tuple = tuple(amount_strs[amount] for amount in amounts)
+        if ahocorasick is not None:
+            hits_by_amount, pct_hits_by_amount = _scan_amount_hits(amount_str_tuple, search_text)
+        else:
+            hits_by_amount = {
+                amount_str: self._find_amount_candidates_regex(amount_str, search_text)
+                for amount_str in amount_str_tuple
+            }
+            pct_hits_by_amount = None
+
+        for amount, amount_str in zip(amounts, amount_str_tuple):
             best_context = ""
             best_context_score = 0
-            
-            for pattern in amount_patterns:
-                # Find all occurrences of this pattern (use raw pattern, not escaped, for word boundaries)
-                for match in re.finditer(pattern, search_text, re.IGNORECASE):
-                    # Get more focused context - look for sentence boundaries or line breaks
-                    start = match.start()
-                    end = match.end()
-                    
-                    # Extend backwards to find start of context
-                    context_start = start
-                    while context_start > 0 and search_text[context_start - 1] not in ['\n', '.', '|']:
-                        context_start -= 1
-                        if start - context_start > 40:  # Limit backward search
-                            break
-                    
-                    # Extend forwards to find end of context
-                    context_end = end
-                    while context_end < len(search_text) and search_text[context_end] not in ['\n', '.', '|']:
-                        context_end += 1
-                        if context_end - end > 40:  # Limit forward search
-                            break
-                    
-                    context = search_text[context_start:context_end].strip()
-                    
-                    # Score context quality
-                    context_score = 0
-                    
-                    # Prefer contexts that contain descriptive words before the amount
-                    descriptive_before = re.search(r'([a-zA-Z\s-]+)(?::\s*|[-\s]+)' + re.escape(pattern), context, re.IGNORECASE)
-                    if descriptive_before:
-                        context_score += 3
-                    
-                    # Prefer contexts with currency symbols
-                    if any(symbol in pattern for symbol in ['Rs.', '₹']):
-                        context_score += 2
-                    
-                    # Prefer shorter, more focused contexts
-                    if len(context) < 80:
-                        context_score += 1
-                    
-                    if context_score > best_context_score:
-                        best_context = context
-                        best_context_score = context_score
+            best_start = 0
+
+            for start, end, has_currency in hits_by_amount.get(amount_str, []):
+                # Get more focused context - look for sentence boundaries or line breaks
+                context_start, context_end = _context_bounds(search_text, start, end)
+                context = search_text[context_start:context_end].strip()
+
+                # Score context quality
+                context_score = 0
+
+                # Prefer contexts that contain descriptive words before the amount
+                matched_text = search_text[start:end]
+                descriptive_before = re.search(r'([a-zA-Z\s-]+)(?::\s*|[-\s]+)' + re.escape(matched_text), context, re.IGNORECASE)
+                if descriptive_before:
+                    context_score += 3
+
+                # Prefer contexts with currency symbols
+                if has_currency:
+                    context_score += 2
+
+                # Prefer shorter, more focused contexts
+                if len(context) < 80:
+                    context_score += 1
+
+                if context_score > best_context_score:
+                    best_context = context
+                    best_context_score = context_score
+                    best_start = start
             
             # Special handling for percentage amounts (like "10%" becoming 10.0)
             # This handles cases where OCR extracts "10" from "10%" in text
             if not best_context and amount <= 100:
-                # Look for percentage patterns - both exact and fuzzy matching
-                percentage_patterns = [
-                    f"{int(amount)}%",
-                    f"{amount:.0f}%", 
-                    f"{amount:.1f}%"
-                ]
-                
-                for perc_pattern in percentage_patterns:
-                    perc_match = re.search(re.escape(perc_pattern), text, re.IGNORECASE)
-                    if perc_match:
-                        # Get context around the percentage
-                        start = perc_match.start()
-                        end = perc_match.end()
-                        
-                        # Find start of line or context
-                        context_start = start
-                        while context_start > 0 and text[context_start - 1] not in ['\n']:
-                            context_start -= 1
-                            if start - context_start > 30:
-                                break
-                        
-                        # Find end of line or context  
-                        context_end = end
-                        while context_end < len(text) and text[context_end] not in ['\n']:
-                            context_end += 1
-                            if context_end - end > 30:
-                                break
-                        
-                        context = text[context_start:context_end].strip()
+                # Percentage hits come from the same automaton pass; fall back
+                # to per-pattern searches only when the automaton is unavailable
+                if pct_hits_by_amount is not None:
+                    pct_candidates = pct_hits_by_amount.get(amount_str, [])
+                else:
+                    pct_candidates = self._find_pct_candidates_regex(amount, search_text)
+
+                for pct_start, pct_end in pct_candidates:
+                    # Get line-bounded context around the percentage
+                    context_start, context_end = _context_bounds(
+                        search_text, pct_start, pct_end, stops='\n', limit=30
+                    )
+                    context = search_text[context_start:context_end].strip()
+                    if context:
                         best_context = context
                         best_context_score = 5  # High score for percentage matches
+                        best_start = pct_start
                         break
                 
                 # Also try general percentage pattern search for small amounts
@@ -221,152 +590,131 @@ class ClassificationService:
                     # Look for any percentage near this amount value
                     perc_search = re.search(r'\b' + str(int(amount)) + r'%', text, re.IGNORECASE)
                     if perc_search:
-                        # Get context around this percentage
+                        # Get context around this percentage, snapped out to the
+                        # enclosing newlines
                         start = perc_search.start()
                         end = perc_search.end()
-                        
-                        context_start = max(0, start - 20)
-                        while context_start > 0 and text[context_start] not in ['\n']:
-                            context_start -= 1
-                        
-                        context_end = min(len(text), end + 20)
-                        while context_end < len(text) and text[context_end] not in ['\n']:
-                            context_end += 1
-                        
+
+                        context_start = max(0, text.rfind('\n', 0, max(0, start - 20) + 1))
+
+                        context_end = text.find('\n', min(len(text), end + 20))
+                        if context_end == -1:
+                            context_end = len(text)
+
                         context = text[context_start:context_end].strip()
                         if context:
                             best_context = context
                             best_context_score = 4
+                            best_start = start
             
             # Fallback to simple context if no good match found
             if not best_context:
                 # Just find the amount as a number and get surrounding text
-                amount_str = str(int(amount)) if amount.is_integer() else str(amount)
                 pos = text.find(amount_str)
                 if pos >= 0:
                     start = max(0, pos - 30)
                     end = min(len(text), pos + len(amount_str) + 30)
                     best_context = text[start:end]
+                    best_start = pos
                 else:
                     best_context = text[:60]  # Last resort
-            
-            amount_contexts[amount] = best_context
-        
+
+            amount_contexts[amount] = (best_context, best_start)
+
         return amount_contexts
-    
-    def _classify_single_amount(self, amount: float, context: str, full_text: str) -> Tuple[AmountType, float, str]:
+
+    def _find_pct_candidates_regex(self, amount: float, search_text: str) -> List[Tuple[int, int]]:
+        """
+        Regex fallback for percentage scanning when pyahocorasick is
+        unavailable. Returns (start, end) hits for the percentage forms of
+        the amount.
+        """
+        candidates = []
+        seen = set()
+        for perc_pattern in (f"{int(amount)}%", f"{amount:.0f}%", f"{amount:.1f}%"):
+            if perc_pattern in seen:
+                continue
+            seen.add(perc_pattern)
+            perc_match = re.search(re.escape(perc_pattern), search_text, re.IGNORECASE)
+            if perc_match:
+                candidates.append((perc_match.start(), perc_match.end()))
+        return candidates
+
+    def _find_amount_candidates_regex(self, amount_str: str, search_text: str) -> List[Tuple[int, int, bool]]:
+        """
+        Regex fallback for amount occurrence scanning when pyahocorasick is
+        unavailable. Returns (start, end, has_currency) hits in the same
+        variant-priority order as the automaton path.
+        """
+        amount_patterns = [
+            (f"Rs\\.{amount_str}\\b", True),
+            (f"Rs\\. {amount_str}\\b", True),
+            (f"₹{amount_str}\\b", True),
+            (f"₹ {amount_str}\\b", True),
+            (f"\\b{amount_str}\\b", False),  # Word boundaries to prevent partial matches
+        ]
+        candidates = []
+        for pattern, has_currency in amount_patterns:
+            for match in re.finditer(pattern, search_text, re.IGNORECASE):
+                candidates.append((match.start(), match.end(), has_currency))
+        return candidates
+
+    def _classify_single_amount(
+        self,
+        amount: float,
+        amount_str: str,
+        context: str,
+        context_lower: str,
+        full_text: str,
+        full_text_lower: str
+    ) -> Tuple[AmountType, float, str]:
         """
         Classify a single amount based on its context.
-        
+
         Args:
             amount: Amount to classify
+            amount_str: Pre-computed string form of amount
             context: Local context around the amount
+            context_lower: Pre-lowered copy of context
             full_text: Full text for additional context
-            
+            full_text_lower: Pre-lowered copy of full_text
+
         Returns:
             Tuple of (AmountType, confidence, source_description)
         """
         # STEP 1: Check for direct associations (words immediately before amount with currency)
         # This should override general context matching
-        amount_str = str(int(amount)) if amount.is_integer() else str(amount)
         direct_association_found = False
         direct_type = None
         
-        # Patterns for direct association: "Service: Rs.Amount" or "Service Rs.Amount"  
-        # Use greedy matching and include hyphens for compound words like "X-Ray"
-        direct_patterns = [
-            r'([a-zA-Z][a-zA-Z\s\-]+):\s*Rs\.?\s*' + re.escape(amount_str),
-            r'([a-zA-Z][a-zA-Z\s\-]+)\s+Rs\.?\s*' + re.escape(amount_str),
-            r'([a-zA-Z][a-zA-Z\s\-]+)\s*₹\s*' + re.escape(amount_str),
-        ]
-        
-        for pattern in direct_patterns:
-            match = re.search(pattern, context, re.IGNORECASE)
-            if match:
-                service_name = match.group(1).strip().lower()
-                
-                # Map service names to types (check all variations)
-                # Start with medical bill financial terms for better precision
-                service_mappings = {
-                    # Financial terms - be specific about different types of "amount"
-                    'final amount': 'total_bill',
-                    'grand total': 'total_bill',
-                    'net amount': 'total_bill',
-                    'total amount': 'total_bill', 
-                    'sub total': 'total_bill',
-                    'subtotal': 'total_bill',
-                    'amount paid': 'paid',
-                    'paid amount': 'paid',
-                    'payment': 'paid',
-                    'amount due': 'due',
-                    'due amount': 'due',
-                    'balance': 'due',
-                    'outstanding': 'due',
-                    'discount': 'discount',
-                    'concession': 'discount',
-                    'tax': 'tax',
-                    'gst': 'tax',
-                    'vat': 'tax',
-                    # Medical services
-                    'consultation': 'consultation',
-                    'consult': 'consultation',
-                    'x-ray': 'x_ray', 
-                    'x ray': 'x_ray',
-                    'xray': 'x_ray',
-                    'medicine': 'medicine',
-                    'medication': 'medicine',
-                    'blood test': 'blood_test',
-                    'blood': 'blood_test',
-                    'ultrasound': 'ultrasound',
-                    'scan': 'scan',
-                    'injection': 'injection',
-                    'ecg': 'ecg',
-                    'nursing': 'nursing',
-                    'physiotherapy': 'physiotherapy',
-                    'physio': 'physiotherapy',
-                    'mri': 'mri',
-                    'ct scan': 'ct_scan',
-                    'ct': 'ct_scan',
-                    'pet scan': 'pet_scan',
-                    'pet': 'pet_scan',
-                    'endoscopy': 'endoscopy',
-                    'biopsy': 'biopsy',
-                    'surgery': 'surgery',
-                    'operation': 'surgery',
-                    'lab test': 'lab_test',
-                    'laboratory': 'lab_test',
-                    'pathology': 'pathology',
-                    'radiology': 'radiology',
-                    'total': 'total_bill',
-                    'paid': 'paid',
-                    'due': 'due',
-                    'discount': 'discount',
-                    'tax': 'tax'
-                }
-                
-                for service_key, amount_type in service_mappings.items():
-                    if service_key in service_name:
-                        direct_association_found = True
-                        direct_type = amount_type
-                        break
-                
-                # If no exact match found, check if it looks like a medical service
-                if not direct_association_found:
-                    # Check if the service name looks like a medical service
-                    # (not total, paid, due, discount, tax - which are financial terms)
-                    financial_terms = {'total', 'paid', 'due', 'discount', 'tax', 'amount', 'bill', 'balance'}
-                    if (service_name.lower() not in financial_terms and 
-                        len(service_name.strip()) > 2 and  # Not just abbreviations like "Rs"
-                        service_name.replace(' ', '').isalpha()):  # Contains only letters and spaces
-                        
-                        # Treat it as a medical service with the service name as type
-                        direct_association_found = True
-                        # Convert service name to valid enum format (lowercase, replace spaces with underscores)
-                        direct_type = service_name.lower().replace(' ', '_').replace('-', '_')
-                        logger.info(f"Unknown medical service detected: '{service_name}' -> '{direct_type}'")
-                
-                if direct_association_found:
-                    break
+        # Single alternation for direct associations ("Service: Rs.Amount",
+        # "Service Rs.Amount", "Service ₹Amount"), compiled once per amount
+        # and cached, instead of three per-call patterns
+        for match in _direct_association_regex(amount_str).finditer(context):
+            service_name = match.group(1).strip().lower()
+
+            # Map service names to types (check all variations, longest key wins)
+            service_key = _lookup_service_key(service_name)
+            if service_key is not None:
+                direct_association_found = True
+                direct_type = _SERVICE_MAPPINGS[service_key]
+
+            # If no exact match found, check if it looks like a medical service
+            if not direct_association_found:
+                # Check if the service name looks like a medical service
+                # (not total, paid, due, discount, tax - which are financial terms)
+                if (service_name.lower() not in _FINANCIAL_TERMS and
+                    len(service_name.strip()) > 2 and  # Not just abbreviations like "Rs"
+                    service_name.replace(' ', '').isalpha()):  # Contains only letters and spaces
+
+                    # Treat it as a medical service with the service name as type
+                    direct_association_found = True
+                    # Convert service name to valid enum format (lowercase, replace spaces with underscores)
+                    direct_type = service_name.lower().replace(' ', '_').replace('-', '_')
+                    logger.info(f"Unknown medical service detected: '{service_name}' -> '{direct_type}'")
+
+            if direct_association_found:
+                break
         
         # STEP 2: If direct association found, use it with high confidence
         if direct_association_found:
@@ -380,136 +728,161 @@ class ClassificationService:
                 return AmountType.OTHER, 0.9, f"Direct association found: {direct_type}"
         
         # STEP 3: Fall back to keyword-based classification for non-direct associations
-        type_scores = {}
-        
-        for amount_type, keywords in self.amount_type_keywords.items():
-            score = 0
-            matched_keywords = []
-            
-            # Check context for keywords
-            context_lower = context.lower()
-            for keyword in keywords:
-                keyword_pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                matches = len(re.findall(keyword_pattern, context_lower))
-                if matches > 0:
-                    score += matches * 2  # Weight context matches highly
-                    matched_keywords.append(keyword)
-            
-            # Check full text for keywords (lower weight)
+        # Tokenize once, then aggregate scores into a flat per-type list in a
+        # single pass over the matched tokens via the inverted keyword index
+        context_counts = Counter(_KEYWORD_TOKEN_RE.findall(context_lower))
+        full_text_counts = Counter(_KEYWORD_TOKEN_RE.findall(full_text_lower))
+
+        scores = [0.0] * len(self._type_names)
+        matched: Dict[int, List[str]] = {}
+
+        for keyword, count in context_counts.items():
+            # Context matches are weighted highly
+            for type_idx in self._keyword_type_index.get(keyword, ()):
+                scores[type_idx] += count * 2
+                matched.setdefault(type_idx, []).append(keyword)
+
+        for keyword, keyword_types in self._keyword_type_index.items():
+            count = full_text_counts[keyword]
+            if count:
+                for type_idx in keyword_types:
+                    scores[type_idx] += count * 0.5
+
+        for amount_type, keywords in self._multi_keywords.items():
+            type_idx = self._type_index[amount_type]
             for keyword in keywords:
-                keyword_pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                matches = len(re.findall(keyword_pattern, full_text))
-                score += matches * 0.5
-            
-            if score > 0:
-                type_scores[amount_type] = (score, matched_keywords)
-        
+                count = context_lower.count(keyword)
+                if count:
+                    scores[type_idx] += count * 2
+                    matched.setdefault(type_idx, []).append(keyword)
+                count = full_text_lower.count(keyword)
+                if count:
+                    scores[type_idx] += count * 0.5
+
+        # The old dict put keyword-scored types first, in declared order, and
+        # heuristic-only insertions (the large-amount total_bill) last; note
+        # which slots the keywords scored before heuristics run so ties can
+        # resolve the same way
+        keyword_scored = [score > 0 for score in scores]
+
         # Apply heuristics based on amount characteristics
-        type_scores = self._apply_amount_heuristics(amount, type_scores, context, full_text)
-        
-        # Determine best classification
-        if not type_scores:
+        self._apply_amount_heuristics(amount, scores, matched, context_lower, full_text_lower)
+
+        # Determine best classification: first maximum among keyword-scored
+        # slots wins, in declared type order; a heuristic-only slot is
+        # considered last, matching the old dict tie-breaking
+        best_score = max(scores)
+        if best_score <= 0:
             return AmountType.OTHER, 0.2, f"amount: {amount} (no context match)"
-        
-        best_type = max(type_scores.keys(), key=lambda k: type_scores[k][0])
-        best_score, matched_keywords = type_scores[best_type]
+
+        best_idx = -1
+        for type_idx, score in enumerate(scores):
+            if score == best_score and keyword_scored[type_idx]:
+                best_idx = type_idx
+                break
+        if best_idx < 0:
+            best_idx = scores.index(best_score)
+        best_type = self._type_names[best_idx]
+        matched_keywords = matched.get(best_idx, [])
         
         # Calculate confidence
         confidence = min(1.0, best_score * 0.1)  # Scale score to confidence
         
         # Create source description
-        source = self._create_source_description(amount, context, matched_keywords)
+        source = self._create_source_description(amount, amount_str, context, matched_keywords)
         
         return AmountType(best_type), confidence, source
     
     def _apply_amount_heuristics(
-        self, 
-        amount: float, 
-        type_scores: Dict[str, Tuple[float, List[str]]], 
-        context: str, 
-        full_text: str
-    ) -> Dict[str, Tuple[float, List[str]]]:
+        self,
+        amount: float,
+        scores: List[float],
+        matched: Dict[int, List[str]],
+        context_lower: str,
+        full_text_lower: str
+    ) -> None:
         """
         Apply heuristics to improve classification based on amount characteristics.
-        
+
+        Mutates the flat per-type score list and the matched-keyword map in
+        place; a type counts as "scored" when its slot is positive.
+
         Args:
             amount: Amount being classified
-            type_scores: Current type scores
-            context: Local context
-            full_text: Full text
-            
-        Returns:
-            Updated type scores
+            scores: Per-type scores, indexed by self._type_index
+            matched: Matched keywords per scored type index
+            context_lower: Pre-lowered local context
+            full_text_lower: Pre-lowered full text
         """
+        discount_idx = self._type_index['discount']
+        total_idx = self._type_index['total_bill']
+
         # Percentage heuristic
         if 0 < amount <= 100:
             # Could be a percentage
-            if any(char in context.lower() for char in ['%', 'percent', 'discount']):
-                if 'discount' in type_scores:
-                    score, keywords = type_scores['discount']
-                    type_scores['discount'] = (score + 2, keywords + ['percentage_heuristic'])
-        
+            if any(char in context_lower for char in ['%', 'percent', 'discount']):
+                if scores[discount_idx] > 0:
+                    scores[discount_idx] += 2
+                    matched.setdefault(discount_idx, []).append('percentage_heuristic')
+
         # Large amount heuristic (likely total)
         if amount > 1000:
-            if 'total_bill' in type_scores:
-                score, keywords = type_scores['total_bill']
-                type_scores['total_bill'] = (score + 1, keywords + ['large_amount_heuristic'])
-            elif 'total_bill' not in type_scores:
-                type_scores['total_bill'] = (1, ['large_amount_heuristic'])
-        
+            scores[total_idx] += 1
+            matched.setdefault(total_idx, []).append('large_amount_heuristic')
+
         # Small amount heuristic (likely copay or discount)
         if 10 <= amount <= 100:
-            potential_types = ['copay', 'discount']
-            for amount_type in potential_types:
-                if amount_type in type_scores:
-                    score, keywords = type_scores[amount_type]
-                    type_scores[amount_type] = (score + 0.5, keywords + ['small_amount_heuristic'])
-        
-        # Position-based heuristics
-        context_position = full_text.lower().find(context.lower())
-        if context_position >= 0:
-            relative_position = context_position / len(full_text)
-            
-            # Early in text often means total
-            if relative_position < 0.3 and 'total_bill' in type_scores:
-                score, keywords = type_scores['total_bill']
-                type_scores['total_bill'] = (score + 0.5, keywords + ['early_position_heuristic'])
-            
-            # Late in text often means due/balance
-            if relative_position > 0.7 and 'due' in type_scores:
-                score, keywords = type_scores['due']
-                type_scores['due'] = (score + 0.5, keywords + ['late_position_heuristic'])
-        
-        return type_scores
+            for amount_type in ('copay', 'discount'):
+                type_idx = self._type_index[amount_type]
+                if scores[type_idx] > 0:
+                    scores[type_idx] += 0.5
+                    matched.setdefault(type_idx, []).append('small_amount_heuristic')
+
+        # Position-based heuristics. The context comes from the corrected
+        # text while full_text is the cleaned text, so this lookup often
+        # fails; in that case the bonuses are skipped rather than applied
+        # at an assumed offset
+        if full_text_lower:
+            context_position = full_text_lower.find(context_lower)
+            if context_position >= 0:
+                relative_position = context_position / len(full_text_lower)
+
+                # Early in text often means total
+                if relative_position < 0.3 and scores[total_idx] > 0:
+                    scores[total_idx] += 0.5
+                    matched.setdefault(total_idx, []).append('early_position_heuristic')
+
+                # Late in text often means due/balance
+                due_idx = self._type_index['due']
+                if relative_position > 0.7 and scores[due_idx] > 0:
+                    scores[due_idx] += 0.5
+                    matched.setdefault(due_idx, []).append('late_position_heuristic')
     
-    def _create_source_description(self, amount: float, context: str, matched_keywords: List[str]) -> str:
+    def _create_source_description(self, amount: float, amount_str: str, context: str, matched_keywords: List[str]) -> str:
         """
         Create a source description for the classified amount.
-        
+
         Args:
             amount: Classified amount
+            amount_str: Pre-computed string form of amount
             context: Context where amount was found
             matched_keywords: Keywords that matched for classification
-            
+
         Returns:
             Source description string
         """
-        # Find the most relevant part of context around the amount
-        amount_str = str(int(amount)) if amount.is_integer() else str(amount)
-        
-        # Look for currency patterns around the amount
-        currency_patterns = [r'Rs\.?\s*', r'₹\s*', r'INR\s*', r'\$\s*']
-        amount_patterns = []
-        
-        # Create patterns with currency prefixes
-        for curr_pattern in currency_patterns:
-            amount_patterns.extend([
-                f"{curr_pattern}{amount_str}",
-                f"{curr_pattern}{amount:.0f}" if amount.is_integer() else f"{curr_pattern}{amount:.2f}",
-            ])
-        
+        # Numeric variants formatted once, then concatenated with each
+        # currency prefix instead of f-string formatting inside the loop
+        amount_variants = [amount_str, f"{amount:.0f}" if amount.is_integer() else f"{amount:.2f}"]
+
+        amount_patterns = [
+            curr_pattern + variant
+            for curr_pattern in _CURRENCY_PREFIX_PATTERNS
+            for variant in amount_variants
+        ]
+
         # Also try without currency
-        amount_patterns.extend([amount_str, f"{amount:.0f}" if amount.is_integer() else f"{amount:.2f}"])
+        amount_patterns.extend(amount_variants)
         
         best_snippet = ""
         best_context_score = 0
@@ -563,24 +936,25 @@ class ClassificationService:
             else:
                 best_snippet = context[:50]  # Last resort
         
-        # Clean up the snippet
-        best_snippet = re.sub(r'\s+', ' ', best_snippet)
-        
+        # Clean up the snippet (C-level split/join instead of regex substitution)
+        best_snippet = ' '.join(best_snippet.split())
+
         # Remove leading/trailing punctuation but keep meaningful ones
-        best_snippet = re.sub(r'^[:\-\s]+|[:\-\s]+$', '', best_snippet)
+        best_snippet = best_snippet.strip(' :-\t\n')
         
         return best_snippet if best_snippet else f"amount: {amount}"
     
-    def _extract_item_name(self, amount: float, context: str, amount_type: AmountType, source_context: str = "") -> str:
+    def _extract_item_name(self, amount: float, amount_str: str, context: str, amount_type: AmountType, source_context: str = "") -> str:
         """
         Extract specific item name from context or return appropriate type.
-        
+
         Args:
             amount: Amount value
+            amount_str: Pre-computed string form of amount
             context: Context around the amount
             amount_type: Classified amount type
             source_context: Additional context from classification (may contain dynamic service names)
-            
+
         Returns:
             Specific item name or type
         """
@@ -605,119 +979,70 @@ class ClassificationService:
         if amount_type.value in known_medical_services:
             return amount_type.value
         
-        # Define item patterns to look for (more comprehensive)
-        item_patterns = {
-            'consultation': [r'consultation', r'consult', r'doctor\s+fee', r'physician', r'visit'],
-            'x_ray': [r'x[-\s]?ray', r'xray', r'radiograph'],
-            'medicine': [r'medicine', r'medication', r'drugs?', r'pharma'],
-            'blood_test': [r'blood\s+test', r'lab\s+test', r'laboratory', r'blood'],
-            'scan': [r'scan', r'ct\s+scan', r'mri'],
-            'ultrasound': [r'ultrasound', r'sonography', r'sono'],
-            'surgery': [r'surgery', r'operation', r'procedure'],
-            'injection': [r'injection', r'vaccine', r'shot'],
-            'ecg': [r'ecg', r'ekg', r'electrocardiogram'],
-            'physiotherapy': [r'physio', r'therapy', r'rehabilitation', r'physiotherapy'],
-            'ambulance': [r'ambulance', r'transport'],
-            'room_charges': [r'room', r'bed', r'ward', r'accommodation', r'charges'],
-            'nursing': [r'nursing', r'nurse', r'care'],
-            'test': [r'test(?!\s+rs)', r'testing'],  # Avoid matching "Test Rs."
-        }
-        
         context_lower = context.lower()
-        
-        # Score each item type based on context
+
+        # Score every item type independently; dict order breaks ties
         item_scores = {}
-        for item_name, patterns in item_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, context_lower))
-                score += matches
-            
+        for item_name, pattern in _ITEM_PATTERNS.items():
+            score = len(pattern.findall(context_lower))
             if score > 0:
                 item_scores[item_name] = score
-        
+
         # Return the best matching item name
         if item_scores:
             best_item = max(item_scores.keys(), key=lambda k: item_scores[k])
             return best_item
         
-        # If no specific item found, try to extract from context using common patterns
-        # Look for patterns like "Service: Rs.amount" or "Item - Rs.amount"
-        amount_str = str(int(amount)) if amount.is_integer() else str(amount)
-        
-        # More comprehensive patterns to find item descriptions before amounts
-        description_patterns = [
-            r'([a-zA-Z][a-zA-Z\s]+?):\s*Rs\.?\s*' + re.escape(amount_str),
-            r'([a-zA-Z][a-zA-Z\s]+?)\s*-\s*Rs\.?\s*' + re.escape(amount_str),
-            r'([a-zA-Z][a-zA-Z\s]+?)\s+Rs\.?\s*' + re.escape(amount_str),
-            r'([a-zA-Z][a-zA-Z\s]+?)\s*₹\s*' + re.escape(amount_str),
-            # Pattern for "Amount: Rs.XXX Service" format
-            r'Rs\.?\s*' + re.escape(amount_str) + r'\s+([a-zA-Z][a-zA-Z\s]+)',
-        ]
-        
-        for pattern in description_patterns:
-            match = re.search(pattern, context, re.IGNORECASE)
-            if match:
-                item_desc = match.group(1).strip().lower()
-                # Clean up the description
-                item_desc = re.sub(r'[^\w\s]', '', item_desc)
-                item_desc = re.sub(r'\s+', '_', item_desc.strip())
-                
-                # Filter out common non-item words but keep meaningful ones
-                exclude_words = ['item', 'service', 'charge', 'fee', 'cost', 'amount', 'bill', 'rs', 'inr']
-                if item_desc and item_desc not in exclude_words and len(item_desc) > 2:
-                    return item_desc
+        # If no specific item found, try to extract from context using common
+        # patterns like "Service: Rs.amount" or "Item - Rs.amount". Cheap
+        # substring probe first: every description pattern embeds the amount
+        # itself, so if it isn't in the context none of them can match
+        amount_in_context = amount_str in context
+
+        if amount_in_context:
+            for pattern in _description_patterns(amount_str):
+                match = pattern.search(context)
+                if match:
+                    item_desc = match.group(1).strip().lower()
+                    # Clean up the description: drop punctuation, collapse
+                    # whitespace runs to single underscores
+                    item_desc = '_'.join(item_desc.translate(_PUNCT_TABLE).split())
+
+                    # Filter out common non-item words but keep meaningful ones
+                    exclude_words = ['item', 'service', 'charge', 'fee', 'cost', 'amount', 'bill', 'rs', 'inr']
+                    if item_desc and item_desc not in exclude_words and len(item_desc) > 2:
+                        return item_desc
         
         # More aggressive fallback - try to find ANY descriptive word near the amount
         # Look for medical/service-related words in the context
-        medical_service_patterns = [
-            r'\b(consultation|consult|doctor|physician|visit)\b',
-            r'\b(x[-\s]?ray|xray|radiograph)\b', 
-            r'\b(medicine|medication|drugs?|pharma)\b',
-            r'\b(blood|test|lab|laboratory)\b',
-            r'\b(scan|ct|mri|ultrasound|sonography)\b',
-            r'\b(surgery|operation|procedure)\b',
-            r'\b(injection|vaccine|shot)\b',
-            r'\b(ecg|ekg|electrocardiogram)\b',
-            r'\b(physio|therapy|rehabilitation)\b',
-            r'\b(ambulance|transport)\b',
-            r'\b(room|bed|ward|accommodation)\b',
-            r'\b(nursing|nurse|care)\b',
-            r'\b(checkup|examination|exam)\b',
-            r'\b(report|diagnostic|analysis)\b'
-        ]
-        
-        context_lower = context.lower()
-        for pattern in medical_service_patterns:
-            if re.search(pattern, context_lower):
-                # Extract the matched word and clean it
-                match = re.search(pattern, context_lower)
-                if match:
-                    service_name = match.group(1).replace('-', '_').replace(' ', '_')
-                    return service_name
-        
+        best = None
+        for match in _MEDICAL_SERVICE_RE.finditer(context_lower):
+            # Category rank first, text position second - the same order the
+            # per-category searches produced
+            rank = (match.lastgroup, match.start())
+            if best is None or rank < best[0]:
+                best = (rank, match.group(match.lastgroup))
+        if best:
+            # Extract the matched word and clean it
+            service_name = best[1].replace('-', '_').replace(' ', '_')
+            return service_name
+
         # If still no match, try to extract any meaningful word before the amount
         # Look for pattern: "Word Rs.Amount" or "Word: Rs.Amount"
-        word_before_amount = re.search(r'\b([a-zA-Z]{3,})\s*:?\s*Rs\.?\s*' + re.escape(amount_str), context, re.IGNORECASE)
-        if word_before_amount:
-            word = word_before_amount.group(1).lower()
-            exclude_generic = ['item', 'service', 'charge', 'fee', 'cost', 'amount', 'bill', 'total', 'paid', 'due', 'balance']
-            if word not in exclude_generic:
-                return word
+        if amount_in_context:
+            word_before_amount = _word_before_amount_regex(amount_str).search(context)
+            if word_before_amount:
+                word = word_before_amount.group(1).lower()
+                exclude_generic = ['item', 'service', 'charge', 'fee', 'cost', 'amount', 'bill', 'total', 'paid', 'due', 'balance']
+                if word not in exclude_generic:
+                    return word
         
         # Last resort: use the classified type or generic service name
         if amount_type.value != 'other':
             return amount_type.value
-        else:
-            # Generate a generic but meaningful name based on amount value
-            if amount >= 1000:
-                return 'major_service'
-            elif amount >= 500:
-                return 'standard_service'
-            elif amount >= 100:
-                return 'minor_service'
-            else:
-                return 'basic_service'
+
+        # Generate a generic but meaningful name based on amount value
+        return _SERVICE_TIER_LABELS[bisect_right(_SERVICE_TIER_THRESHOLDS, amount)]
     
     def _resolve_classification_conflicts(self, classified_amounts: List[AmountItem], original_text: str) -> List[AmountItem]:
         """
@@ -737,38 +1062,38 @@ class ClassificationService:
         # Service types (consultation, x_ray, medicine, etc.) should NOT be resolved
         standard_billing_types = ['total_bill', 'due', 'paid', 'discount', 'tax', 'copay']
         
-        type_groups = {}
+        # One pass buckets standard billing types for conflict resolution and
+        # passes service types (consultation, x_ray, ...) straight through
+        type_groups = defaultdict(list)
+        resolved_amounts = []
         for item in classified_amounts:
-            # Only group standard billing types for conflict resolution
             if item.type in standard_billing_types:
-                if item.type not in type_groups:
-                    type_groups[item.type] = []
                 type_groups[item.type].append(item)
-        
-        # Start with all amounts
-        resolved_amounts = []
-        
-        # First, add all service types (non-standard types) without conflict resolution
-        for item in classified_amounts:
-            if item.type not in standard_billing_types:
+            else:
                 resolved_amounts.append(item)
         
-        # Then resolve conflicts only for standard billing types
+        # Then resolve conflicts only for standard billing types, maintaining
+        # a type -> items index of the resolved results as we go so the
+        # relationship rules don't have to rescan the list
+        resolved_index = defaultdict(list)
         for amount_type, items in type_groups.items():
             if len(items) == 1:
                 resolved_amounts.extend(items)
+                resolved_index[amount_type].extend(items)
             else:
                 # Multiple items of same standard type - keep the one with highest value
                 if amount_type in ['total_bill', 'due', 'paid']:
                     # For these types, usually want the highest value
                     best_item = max(items, key=lambda x: x.value)
                     resolved_amounts.append(best_item)
-                    
+                    resolved_index[amount_type].append(best_item)
+
                     # For duplicates, generate unique names instead of 'other'
                     for i, item in enumerate(items):
                         if item != best_item:
                             item.type = f"{amount_type}_{i+1}"  # e.g., "paid_2", "total_bill_2"
                             resolved_amounts.append(item)
+                            resolved_index[item.type].append(item)
                 else:
                     # For discount, tax, copay - keep all with unique names if needed
                     if len(items) > 1:
@@ -776,47 +1101,68 @@ class ClassificationService:
                             if i > 0:  # Keep first as-is, number the rest
                                 item.type = f"{amount_type}_{i+1}"
                     resolved_amounts.extend(items)
-        
+                    for item in items:
+                        resolved_index[item.type].append(item)
+
         # Apply relationship-based improvements
-        resolved_amounts = self._apply_relationship_rules(resolved_amounts)
-        
+        resolved_amounts = self._apply_relationship_rules(resolved_amounts, resolved_index)
+
         return resolved_amounts
-    
-    def _apply_relationship_rules(self, amounts: List[AmountItem]) -> List[AmountItem]:
+
+    def _apply_relationship_rules(self, amounts: List[AmountItem], buckets: Dict[str, List[AmountItem]]) -> List[AmountItem]:
         """
         Apply rules based on relationships between amounts.
-        
+
         Args:
             amounts: List of classified amounts
-            
+            buckets: Prebuilt type -> items index over the same list
+
         Returns:
             List with improved classifications
         """
         if len(amounts) < 2:
             return amounts
-        
-        # Find total, paid, and due amounts
-        total_items = [item for item in amounts if item.type == AmountType.TOTAL_BILL.value]
-        paid_items = [item for item in amounts if item.type == AmountType.PAID.value]
-        due_items = [item for item in amounts if item.type == AmountType.DUE.value]
+
+        total_items = buckets.get(AmountType.TOTAL_BILL.value, [])
+        paid_items = buckets.get(AmountType.PAID.value, [])
+        due_items = buckets.get(AmountType.DUE.value, [])
         
         # Apply total = paid + due rule
         if len(total_items) == 1 and len(paid_items) == 1 and len(due_items) == 1:
-            total_val = total_items[0].value
-            paid_val = paid_items[0].value
-            due_val = due_items[0].value
-            
-            # Check if relationship holds (with small tolerance for rounding)
-            if abs(total_val - (paid_val + due_val)) < 0.01:
-                # Relationship confirmed - increase confidence implicitly
-                # This could be used to boost confidence scores if needed
-                pass
-            elif abs(paid_val - (total_val + due_val)) < 0.01:
-                # Paid is actually total + due (unusual but possible)
-                # Could swap classifications
-                pass
-        
+            # Integer cents make the tolerance check an exact compare
+            total_cents = int(round(total_items[0].value * 100))
+            paid_cents = int(round(paid_items[0].value * 100))
+            due_cents = int(round(due_items[0].value * 100))
+
+            if total_cents == paid_cents + due_cents:
+                # Relationship confirmed - mark the amounts involved
+                total_items[0].relationship_verified = True
+                paid_items[0].relationship_verified = True
+                due_items[0].relationship_verified = True
+
         return amounts
 
 # Global classification service instance
-classification_service = ClassificationService()
\ No newline at end of file
+classification_service = ClassificationService()
+
+
+# Module-level memoized entry points. Classification is pure given its
+# inputs, and the same (amount, context) pairs recur across retries and
+# duplicated amounts, so cache hits skip the whole regex/heuristic pipeline.
+@lru_cache(maxsize=4096)
+def _classify_single_amount_cached(
+    amount: float,
+    amount_str: str,
+    context: str,
+    context_lower: str,
+    full_text: str,
+    full_text_lower: str
+) -> Tuple[AmountType, float, str]:
+    return classification_service._classify_single_amount(
+        amount, amount_str, context, context_lower, full_text, full_text_lower
+    )
+
+
+@lru_cache(maxsize=4096)
+def _extract_item_name_cached(amount: float, amount_str: str, context: str, amount_type: AmountType, source_context: str) -> str:
+    return classification_service._extract_item_name(amount, amount_str, context, amount_type, source_context)
\ No newline at end of file
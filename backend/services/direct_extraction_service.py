@@ -3,101 +3,350 @@ Direct Extraction Service - Simple and reliable approach to extract medical bill
 Instead of complex classification, directly extract and label amounts based on line patterns.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
+
+import numpy as np
 from models.request_models import AmountItem
 from utils.text_utils import TextProcessor
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prebound C-level digit scan for the per-line guard; cheaper than a
+# Python-level any() over every char
+_DIGIT_FINDER = re.compile(r'\d').search
+
+@dataclass
+class AmountBatch:
+    """
+    Struct-of-arrays container for extracted amounts.
+
+    The extraction hot path only ever reduces over one field at a time
+    (values for dedup, types for grouping), so parallel lists beat a list
+    of AmountItem objects; items are materialized once at the API boundary.
+    """
+    types: List[str] = field(default_factory=list)
+    values: List[float] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+
+    def append(self, type_: str, value: float, source: str) -> None:
+        self.types.append(type_)
+        self.values.append(value)
+        self.sources.append(source)
+
+    def to_items(self) -> List[AmountItem]:
+        """Materialize AmountItem objects for callers."""
+        return [
+            AmountItem(type=type_, value=value, source=source)
+            for type_, value, source in zip(self.types, self.values, self.sources)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def _is_word_char(ch: str) -> bool:
+    """Word-character test matching the regex \\b definition."""
+    return ch.isalnum() or ch == '_'
+
+def _find_numbers(line: str) -> List[str]:
+    """
+    Single-pass scan for standalone numbers in a line.
+
+    Behaves like re.findall(r'\\b(\\d+\\.?\\d*)\\b', line) — digits with an
+    optional decimal part, bounded by word boundaries — without the regex
+    engine overhead on the fallback path.
+    """
+    numbers = []
+    n = len(line)
+    i = 0
+    while i < n:
+        ch = line[i]
+        if not ch.isdecimal():
+            i += 1
+            continue
+        if i > 0 and _is_word_char(line[i - 1]):
+            # Digits glued to a word ("a123") fail the leading boundary;
+            # skip the rest of the word run
+            i += 1
+            while i < n and _is_word_char(line[i]):
+                i += 1
+            continue
+        start = i
+        i += 1
+        while i < n and line[i].isdecimal():
+            i += 1
+        if i < n and line[i] == '.':
+            j = i + 1
+            while j < n and line[j].isdecimal():
+                j += 1
+            if j > i + 1 and (j >= n or not _is_word_char(line[j])):
+                # "12.34" with a clean trailing boundary
+                numbers.append(line[start:j])
+                i = j
+                continue
+            if i + 1 < n and _is_word_char(line[i + 1]):
+                # "12.5a" / "12.x" — the decimal part fails its boundary but
+                # the dot-to-word transition is itself a boundary, so the
+                # match ends just after the dot (regex backtracking does the
+                # same)
+                numbers.append(line[start:i + 1])
+                i += 1
+                continue
+            # Bare trailing dot ("12." at end of line or before punctuation):
+            # the match ends before it
+        if i < n and _is_word_char(line[i]):
+            # Trailing boundary failed ("123a"); drop the run
+            while i < n and _is_word_char(line[i]):
+                i += 1
+            continue
+        numbers.append(line[start:i])
+    return numbers
+
 class DirectExtractionService:
     """Service for direct extraction of amounts from medical bills."""
     
     def __init__(self):
         self.text_processor = TextProcessor()
         
-        # Simple pattern mappings for common medical bill line types
+        # Simple pattern mappings for common medical bill line types.
+        # Multi-word phrases allow only spaces/tabs between words so a
+        # phrase never spans a line break when whole text is scanned at once
         self.line_patterns = [
             # Order matters - more specific patterns first
-            (r'\b(sub\s+total|subtotal)\b.*?(\d+\.?\d*)', "Sub Total"),
-            (r'\b(grand\s+total|total\s+amount)\b.*?(\d+\.?\d*)', "Grand Total"),
-            (r'\b(final\s+amount|net\s+amount)\b.*?(\d+\.?\d*)', "Final Amount"),
-            (r'\b(amount\s+paid|paid\s+amount|payment)\b.*?(\d+\.?\d*)', "Amount Paid"),
-            (r'\b(balance|balance\s+due|outstanding|due)\b.*?(\d+\.?\d*)', "Balance Due"),
-            (r'\b(discount|concession|reduction)\b.*?(\d+\.?\d*)', "Discount"),
-            (r'\b(tax|gst|vat|service\s+tax)\b.*?(\d+\.?\d*)', "Tax"),
-            (r'\b(copay|co-pay|patient\s+share)\b.*?(\d+\.?\d*)', "Co-pay"),
-            (r'\b(deductible|excess)\b.*?(\d+\.?\d*)', "Deductible"),
-            (r'\b(insurance|covered|claim)\b.*?(\d+\.?\d*)', "Insurance"),
-            (r'\b(consultation|consult)\b.*?(\d+\.?\d*)', "Consultation"),
-            (r'\b(x-?ray|xray)\b.*?(\d+\.?\d*)', "X-Ray"),
-            (r'\b(medicine|medication|drugs?)\b.*?(\d+\.?\d*)', "Medicine"),
-            (r'\b(blood\s+test|blood)\b.*?(\d+\.?\d*)', "Blood Test"),
-            (r'\b(ultrasound|scan)\b.*?(\d+\.?\d*)', "Scan"),
-            (r'\b(injection|shot)\b.*?(\d+\.?\d*)', "Injection"),
-            (r'\b(ecg|ekg)\b.*?(\d+\.?\d*)', "ECG"),
-            (r'\b(mri)\b.*?(\d+\.?\d*)', "MRI"),
-            (r'\b(ct\s+scan|ct)\b.*?(\d+\.?\d*)', "CT Scan"),
-            (r'\b(total)\b.*?(\d+\.?\d*)', "Total"),  # Generic total - place near end
+            (r'\b(?:sub[ \t]+total|subtotal)\b.*?(\d+\.?\d*)', "Sub Total"),
+            (r'\b(?:grand[ \t]+total|total[ \t]+amount)\b.*?(\d+\.?\d*)', "Grand Total"),
+            (r'\b(?:final[ \t]+amount|net[ \t]+amount)\b.*?(\d+\.?\d*)', "Final Amount"),
+            (r'\b(?:amount[ \t]+paid|paid[ \t]+amount|payment)\b.*?(\d+\.?\d*)', "Amount Paid"),
+            (r'\b(?:balance|balance[ \t]+due|outstanding|due)\b.*?(\d+\.?\d*)', "Balance Due"),
+            (r'\b(?:discount|concession|reduction)\b.*?(\d+\.?\d*)', "Discount"),
+            (r'\b(?:tax|gst|vat|service[ \t]+tax)\b.*?(\d+\.?\d*)', "Tax"),
+            (r'\b(?:copay|co-pay|patient[ \t]+share)\b.*?(\d+\.?\d*)', "Co-pay"),
+            (r'\b(?:deductible|excess)\b.*?(\d+\.?\d*)', "Deductible"),
+            (r'\b(?:insurance|covered|claim)\b.*?(\d+\.?\d*)', "Insurance"),
+            (r'\b(?:consultation|consult)\b.*?(\d+\.?\d*)', "Consultation"),
+            (r'\b(?:x-?ray|xray)\b.*?(\d+\.?\d*)', "X-Ray"),
+            (r'\b(?:medicine|medication|drugs?)\b.*?(\d+\.?\d*)', "Medicine"),
+            (r'\b(?:blood[ \t]+test|blood)\b.*?(\d+\.?\d*)', "Blood Test"),
+            (r'\b(?:ultrasound|scan)\b.*?(\d+\.?\d*)', "Scan"),
+            (r'\b(?:injection|shot)\b.*?(\d+\.?\d*)', "Injection"),
+            (r'\b(?:ecg|ekg)\b.*?(\d+\.?\d*)', "ECG"),
+            (r'\b(?:mri)\b.*?(\d+\.?\d*)', "MRI"),
+            (r'\b(?:ct[ \t]+scan|ct)\b.*?(\d+\.?\d*)', "CT Scan"),
+            (r'\b(?:total)\b.*?(\d+\.?\d*)', "Total"),  # Generic total - place near end
+        ]
+
+        # Patterns are tried per line in declared order - an earlier pattern
+        # beats a later one even when the later one matches earlier in the
+        # line - so they stay compiled individually. The alternation below
+        # only prefilters: a line no branch matches cannot match any pattern,
+        # so the per-pattern loop runs on matching lines only
+        self._compiled_patterns = [
+            (re.compile(pattern, re.IGNORECASE), label)
+            for pattern, label in self.line_patterns
         ]
+        self._line_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern, _ in self.line_patterns),
+            re.IGNORECASE
+        )
     
+    def _prepare(self, text: str) -> str:
+        """
+        Run OCR corrections once per input.
+
+        Args:
+            text: OCR text from medical bill
+
+        Returns:
+            Corrected text
+        """
+        corrected_text, corrections = self.text_processor.correct_ocr_digits(text)
+        logger.info(f"Applied {len(corrections)} OCR corrections")
+        return corrected_text
+
     def extract_from_text(self, text: str) -> List[AmountItem]:
         """
         Extract amounts directly from text using line-by-line pattern matching.
-        
+
         Args:
             text: OCR text from medical bill
-            
+
         Returns:
             List of AmountItem objects with direct extraction results
         """
+        corrected_text = self._prepare(text)
+        if corrected_text.count('\n') > 256:
+            # Large documents go through the parallel chunked scan
+            return self._match_lines(corrected_text.splitlines()).to_items()
+        return self._scan_text(corrected_text).to_items()
+
+    def _match_line(self, line: str, first_pattern: int = 0) -> Optional[Tuple[int, str, str]]:
+        """
+        Try the line patterns in declared order, starting at first_pattern.
+
+        Args:
+            line: Stripped line to match
+            first_pattern: Index of the first pattern to try
+
+        Returns:
+            (pattern_idx, label, amount_str) for the first pattern that
+            matches, or None
+        """
+        for pattern_idx in range(first_pattern, len(self._compiled_patterns)):
+            pattern, label = self._compiled_patterns[pattern_idx]
+            match = pattern.search(line)
+            if match:
+                return pattern_idx, label, match.group(1)
+        return None
+
+    def _scan_text(self, corrected_text: str) -> AmountBatch:
+        """
+        Stream the prefilter regex over the whole text without splitting it.
+
+        The engine walks the buffer once to find lines worth matching; each
+        hit line then goes through the per-pattern priority loop. Line
+        numbers and line snippets are recovered lazily around each hit.
+
+        Args:
+            corrected_text: OCR-corrected text from _prepare
+
+        Returns:
+            AmountBatch with direct extraction results
+        """
         try:
-            # Apply OCR corrections first
-            corrected_text, corrections = self.text_processor.correct_ocr_digits(text)
-            
-            logger.info(f"Applied {len(corrections)} OCR corrections")
-            
-            # Split into lines and process each line
-            lines = corrected_text.split('\n')
-            extracted_amounts = []
-            used_amounts = set()  # Avoid duplicates
-            
-            for line_num, line in enumerate(lines):
-                line = line.strip()
-                if not line or not any(char.isdigit() for char in line):
-                    continue
-                
-                # Try each pattern
-                for pattern_regex, label in self.line_patterns:
-                    match = re.search(pattern_regex, line, re.IGNORECASE)
-                    if match:
-                        try:
-                            # Extract the amount (usually the last captured group)
-                            amount_str = match.group(2) if len(match.groups()) >= 2 else match.group(1)
-                            amount = float(amount_str)
-                            
-                            # Create a unique key to avoid duplicates
-                            amount_key = (label, amount)
-                            if amount_key not in used_amounts:
-                                extracted_amounts.append(AmountItem(
-                                    type=label,
-                                    value=amount,
-                                    source=f"Line {line_num + 1}: {line}"
-                                ))
-                                used_amounts.add(amount_key)
-                                logger.debug(f"Extracted {label}: ₹{amount} from '{line}'")
-                                break  # Stop at first match for this line
-                        except (ValueError, IndexError) as e:
-                            logger.warning(f"Failed to extract amount from line: {line} - {e}")
-                            continue
-            
-            logger.info(f"Direct extraction completed: {len(extracted_amounts)} amounts found")
-            return extracted_amounts
-            
+            matches = []
+            total_len = len(corrected_text)
+            pos = 0
+            line_num = 0
+            counted_upto = 0
+            while pos < total_len:
+                match = self._line_re.search(corrected_text, pos)
+                if not match:
+                    break
+                # Advance the line counter to the line holding this match
+                line_num += corrected_text.count('\n', counted_upto, match.start())
+                counted_upto = match.start()
+                line_start = corrected_text.rfind('\n', 0, match.start()) + 1
+                line_end = corrected_text.find('\n', match.end())
+                if line_end == -1:
+                    line_end = total_len
+                line = corrected_text[line_start:line_end].strip()
+                hit = self._match_line(line)
+                if hit:
+                    pattern_idx, label, amount_str = hit
+                    matches.append((line_num, line, pattern_idx, label, amount_str))
+                # Skip the rest of this line
+                pos = line_end + 1
+            return self._build_batch(matches)
         except Exception as e:
             logger.error(f"Error in direct extraction: {str(e)}")
-            return []
+            return AmountBatch()
+
+    def _scan_chunk(self, lines: List[str], base_idx: int) -> List[Tuple[int, str, int, str, str]]:
+        """
+        Scan a contiguous run of lines with the line patterns.
+
+        Args:
+            lines: Lines to scan
+            base_idx: Line number of the first entry in the full document
+
+        Returns:
+            List of (line_num, line, pattern_idx, label, amount_str) tuples
+        """
+        matches = []
+        for offset, line in enumerate(lines):
+            line = line.strip()
+            if not line or not _DIGIT_FINDER(line):
+                continue
+
+            # Alternation prefilter first; most lines match no pattern and
+            # skip the priority loop entirely
+            if not self._line_re.search(line):
+                continue
+            hit = self._match_line(line)
+            if hit:
+                pattern_idx, label, amount_str = hit
+                matches.append((base_idx + offset, line, pattern_idx, label, amount_str))
+        return matches
+
+    def _match_lines(self, lines: List[str]) -> AmountBatch:
+        """
+        Run the line-pattern matching stage over prepared lines.
+
+        Args:
+            lines: OCR-corrected lines from _prepare
+
+        Returns:
+            AmountBatch with direct extraction results
+        """
+        try:
+            # Collect matches first, then parse all amount strings in one
+            # batched pass; the amount group shape (\d+\.?\d*) guarantees
+            # they are parseable. re releases the GIL while matching, so
+            # multi-page inputs are scanned in parallel chunks
+            if len(lines) > 256:
+                workers = os.cpu_count() or 1
+                chunk_size = -(-len(lines) // workers)  # ceil division
+                spans = [
+                    (lines[start:start + chunk_size], start)
+                    for start in range(0, len(lines), chunk_size)
+                ]
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    chunks = executor.map(
+                        lambda span: self._scan_chunk(*span), spans
+                    )
+                    matches = [match for chunk in chunks for match in chunk]
+            else:
+                matches = self._scan_chunk(lines, 0)
+
+            return self._build_batch(matches)
+
+        except Exception as e:
+            logger.error(f"Error in direct extraction: {str(e)}")
+            return AmountBatch()
+
+    def _build_batch(self, matches: List[Tuple[int, str, int, str, str]]) -> AmountBatch:
+        """
+        Parse and deduplicate scan results into an AmountBatch.
+
+        Args:
+            matches: (line_num, line, pattern_idx, label, amount_str) tuples
+                from a scan
+
+        Returns:
+            AmountBatch with direct extraction results
+        """
+        if matches:
+            values = np.asarray([m[4] for m in matches], dtype=np.float64)
+        else:
+            values = ()
+
+        batch = AmountBatch()
+        used_amounts = set()  # (label, amount) pairs, avoids duplicates
+        for (line_num, line, pattern_idx, label, _), amount in zip(matches, values):
+            amount = float(amount)
+            # Create a unique key to avoid duplicates. A line whose first hit
+            # is already used falls through to its later patterns, as the
+            # per-line loop did when it skipped a duplicate without breaking
+            amount_key = (label, amount)
+            while amount_key in used_amounts:
+                hit = self._match_line(line, pattern_idx + 1)
+                if hit is None:
+                    amount_key = None
+                    break
+                pattern_idx, label, amount_str = hit
+                amount = float(amount_str)
+                amount_key = (label, amount)
+            if amount_key is not None:
+                used_amounts.add(amount_key)
+                batch.append(label, amount, f"Line {line_num + 1}: {line}")
+                logger.debug(f"Extracted {label}: ₹{amount} from '{line}'")
+
+        logger.info(f"Direct extraction completed: {len(batch)} amounts found")
+        return batch
     
     def extract_with_fallback(self, text: str) -> List[AmountItem]:
         """
@@ -109,39 +358,36 @@ class DirectExtractionService:
         Returns:
             List of AmountItem objects including fallback extractions
         """
+        # Correct and split once; both stages reuse the same lines
+        lines = self._prepare(text).splitlines()
+
         # First try direct pattern matching
-        extracted_amounts = self.extract_from_text(text)
-        
-        # Fallback: find any remaining lines with amounts that weren't matched
-        corrected_text, _ = self.text_processor.correct_ocr_digits(text)
-        lines = corrected_text.split('\n')
-        
-        # Get already extracted amounts to avoid duplicates
-        extracted_values = {item.value for item in extracted_amounts}
-        
+        batch = self._match_lines(lines)
+
+        # One dedup structure for both stages: values already emitted by the
+        # pattern stage plus values the fallback itself adds
+        extracted_values = dict.fromkeys(batch.values, 1)
+
         for line_num, line in enumerate(lines):
             line = line.strip()
-            if not line or not any(char.isdigit() for char in line):
+            if not line or not _DIGIT_FINDER(line):
                 continue
-            
+
             # Find all amounts in this line
-            amount_matches = re.findall(r'\b(\d+\.?\d*)\b', line)
+            amount_matches = _find_numbers(line)
             for amount_str in amount_matches:
                 try:
                     amount = float(amount_str)
                     # Only include if it's a reasonable amount and not already extracted
                     if amount >= 1.0 and amount not in extracted_values:
-                        extracted_amounts.append(AmountItem(
-                            type="Other Amount",
-                            value=amount,
-                            source=f"Line {line_num + 1}: {line}"
-                        ))
-                        extracted_values.add(amount)
+                        extracted_values[amount] = 1
+                        batch.append("Other Amount", amount, f"Line {line_num + 1}: {line}")
                         logger.debug(f"Fallback extraction: ₹{amount} from '{line}'")
                 except ValueError:
                     continue
-        
-        return extracted_amounts
+
+        # Materialize AmountItems only at the boundary
+        return batch.to_items()
     
     def format_results(self, amounts: List[AmountItem]) -> Dict:
         """
@@ -1,5 +1,9 @@
 import logging
+import re
+from functools import lru_cache
 from typing import List, Tuple, Dict
+
+import numpy as np
 from models.data_models import NormalizedAmount, RawToken
 from models.request_models import NormalizationResponse
 from utils.text_utils import text_processor
@@ -8,12 +12,25 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Pre-filter for directly parseable tokens; fullmatch here means float() cannot
+# raise, so the common path never pays exception setup for noisy OCR tokens
+_PLAIN_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# Fallback patterns tried in priority order: decimals first, then
+# comma-separated thousands, then bare integers
+_FALLBACK_PATTERNS = (
+    re.compile(r'\d+\.\d{1,2}'),  # Decimal amounts
+    re.compile(r'\d{1,3}(?:,\d{3})*'),  # Comma-separated thousands
+    re.compile(r'\d+'),  # Simple integers
+)
+
 class NormalizationService:
     """Service for normalizing extracted amounts and correcting OCR errors."""
     
     def __init__(self):
         self.min_confidence = settings.MIN_AMOUNT_CONFIDENCE
         self.correction_map = settings.OCR_DIGIT_CORRECTIONS
+        self.translation_table = settings.OCR_TRANSLATION_TABLE
     
     async def normalize_amounts(self, raw_tokens: List[str], ocr_confidence: float = 1.0) -> NormalizationResponse:
         """
@@ -39,10 +56,10 @@ class NormalizationService:
             normalization_scores = []
             
             for token in raw_tokens:
-                try:
-                    # Attempt to parse as float directly first
+                if _PLAIN_NUMBER_RE.fullmatch(token):
+                    # Directly parseable - no try/except needed
                     amount = float(token)
-                    
+
                     # Validate the amount
                     is_valid, error_msg = validation_utils.validate_amount_value(amount)
                     if is_valid:
@@ -51,10 +68,10 @@ class NormalizationService:
                         logger.debug(f"Successfully normalized token '{token}' to {amount}")
                     else:
                         logger.warning(f"Invalid amount {amount}: {error_msg}")
-                
-                except ValueError:
-                    # Try more complex normalization
-                    normalized_amount, confidence = self._complex_normalize(token)
+
+                else:
+                    # Try more complex normalization (memoized - OCR tokens repeat)
+                    normalized_amount, confidence = _complex_normalize_cached(token)
                     if normalized_amount is not None:
                         normalized_amounts.append(normalized_amount)
                         normalization_scores.append(confidence)
@@ -131,16 +148,15 @@ class NormalizationService:
         Returns:
             Tuple of (corrected_token, list_of_corrections)
         """
-        corrected = token
+        # Single C-level pass; all corrections are one char to one char
+        corrected = token.translate(self.translation_table)
+
         corrections = []
-        
-        for wrong_char, correct_char in self.correction_map.items():
-            if wrong_char in corrected:
-                original = corrected
-                corrected = corrected.replace(wrong_char, correct_char)
-                if corrected != original:
+        if corrected != token:
+            for wrong_char, correct_char in self.correction_map.items():
+                if wrong_char in token:
                     corrections.append(f"'{wrong_char}' -> '{correct_char}'")
-        
+
         return corrected, corrections
     
     def _fallback_parsing(self, token: str) -> Tuple[float, float]:
@@ -164,18 +180,10 @@ class NormalizationService:
                 except ValueError:
                     pass
             
-            # Method 2: Try to parse parts of the token
-            import re
-            
-            # Look for patterns like "1234.56" or "1,234"
-            patterns = [
-                r'\d+\.\d{1,2}',  # Decimal amounts
-                r'\d{1,3}(?:,\d{3})*',  # Comma-separated thousands
-                r'\d+'  # Simple integers
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, token)
+            # Method 2: Try to parse parts of the token with the
+            # precompiled patterns ("1234.56", "1,234", ...)
+            for pattern in _FALLBACK_PATTERNS:
+                matches = pattern.findall(token)
                 for match in matches:
                     try:
                         # Remove commas and parse
@@ -234,26 +242,46 @@ class NormalizationService:
         
         if len(amounts) < 2:
             return relationships
-        
+
+        if len(amounts) >= 32:
+            # Dense bills: do the sum and range checks as vectorized passes
+            arr = np.sort(np.asarray(amounts, dtype=np.float64))[::-1]
+            largest = float(arr[0])
+            others = arr[1:]
+            if abs(largest - float(others.sum())) < 0.01:
+                relationships["potential_totals"].append(largest)
+                relationships["potential_parts"].extend(others.tolist())
+            src = np.asarray(amounts, dtype=np.float64)
+            relationships["potential_percentages"].extend(
+                src[(src > 0) & (src < 100)].tolist()
+            )
+            return relationships
+
         # Sort amounts for analysis
         sorted_amounts = sorted(amounts, reverse=True)
-        
+
         # Look for total/parts relationships
         largest = sorted_amounts[0]
         others = sorted_amounts[1:]
-        
+
         # Check if largest amount could be sum of others
         sum_others = sum(others)
         if abs(largest - sum_others) < 0.01:  # Allow for small rounding errors
             relationships["potential_totals"].append(largest)
             relationships["potential_parts"].extend(others)
-        
+
         # Look for percentage-based amounts (amounts < 100 could be percentages)
         for amount in amounts:
             if amount < 100 and amount > 0:
                 relationships["potential_percentages"].append(amount)
-        
+
         return relationships
 
 # Global normalization service instance
-normalization_service = NormalizationService()
\ No newline at end of file
+normalization_service = NormalizationService()
+
+# Module-level cached wrapper so lru_cache keys on the token alone; the
+# correction table behind it is immutable settings data, so results are pure
+@lru_cache(maxsize=4096)
+def _complex_normalize_cached(token: str) -> Tuple[float, float]:
+    return normalization_service._complex_normalize(token)
\ No newline at end of file
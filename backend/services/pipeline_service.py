@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional
 from models.request_models import ProcessingResponse, AmountItem
 from services.ocr_service import ocr_service
 from services.normalization_service import normalization_service
@@ -28,7 +29,7 @@ class AmountDetectionPipeline:
         """
         try:
             logger.info("Starting text processing pipeline")
-            
+
             # Step 1: OCR/Text Extraction
             logger.info("Step 1: Text extraction")
             ocr_result = await ocr_service.extract_from_text(text)
@@ -83,7 +84,7 @@ class AmountDetectionPipeline:
                 classification_result,
                 text
             )
-            
+
         except Exception as e:
             logger.error(f"Pipeline error: {str(e)}")
             return ProcessingResponse(
@@ -108,7 +109,55 @@ class AmountDetectionPipeline:
             # Step 1: OCR/Image Extraction
             logger.info("Step 1: OCR extraction from image")
             ocr_result = await ocr_service.extract_from_image(image_data)
-            
+
+            return await self._continue_image_pipeline(ocr_result)
+
+        except Exception as e:
+            logger.error(f"Image pipeline error: {str(e)}")
+            return ProcessingResponse(
+                status="error",
+                reason=f"Image processing error: {str(e)}",
+                confidence=0.0
+            )
+
+    async def process_image_batch(self, images: List[bytes]) -> List[ProcessingResponse]:
+        """
+        Process several images through the pipeline as one batch.
+
+        OCR for the whole batch is dispatched to the shared worker pool in a
+        single call, then the post-OCR stages run concurrently per image.
+        Results come back in input order.
+
+        Args:
+            images: List of image bytes to process
+
+        Returns:
+            List of ProcessingResponse objects, one per image
+        """
+        if not images:
+            return []
+
+        try:
+            logger.info("Starting batch image pipeline for %d images", len(images))
+            ocr_results = await ocr_service.extract_from_images(list(images))
+            return list(await asyncio.gather(*[
+                self._continue_image_pipeline(ocr_result)
+                for ocr_result in ocr_results
+            ]))
+        except Exception as e:
+            logger.error(f"Batch image pipeline error: {str(e)}")
+            return [
+                ProcessingResponse(
+                    status="error",
+                    reason=f"Image processing error: {str(e)}",
+                    confidence=0.0
+                )
+                for _ in images
+            ]
+
+    async def _continue_image_pipeline(self, ocr_result) -> ProcessingResponse:
+        """Run the post-OCR stages for a single image result."""
+        try:
             if ocr_result.status != "success":
                 return ProcessingResponse(
                     status=ocr_result.status,
@@ -116,16 +165,16 @@ class AmountDetectionPipeline:
                     raw_tokens=ocr_result.raw_tokens,
                     confidence=ocr_result.confidence
                 )
-            
+
             # Use the original OCR text if available, otherwise reconstruct from tokens
             extracted_text = ocr_result.original_text or self._reconstruct_text_from_tokens(ocr_result.raw_tokens)
-            
+
             # Continue with text processing pipeline
             return await self._continue_pipeline_from_ocr(
                 ocr_result,
                 extracted_text
             )
-            
+
         except Exception as e:
             logger.error(f"Image pipeline error: {str(e)}")
             return ProcessingResponse(
@@ -133,7 +182,7 @@ class AmountDetectionPipeline:
                 reason=f"Image processing error: {str(e)}",
                 confidence=0.0
             )
-    
+
     async def _continue_pipeline_from_ocr(self, ocr_result, extracted_text: str) -> ProcessingResponse:
         """
         Continue pipeline processing from OCR results.
@@ -153,7 +202,7 @@ class AmountDetectionPipeline:
                 raw_tokens=ocr_result.raw_tokens,
                 confidence=ocr_result.confidence
             )
-        
+
         # Step 2: Normalization
         logger.info("Step 2: Amount normalization")
         normalization_result = await normalization_service.normalize_amounts(
@@ -223,20 +272,25 @@ class AmountDetectionPipeline:
     ) -> ProcessingResponse:
         """
         Assemble the final output from all pipeline stages.
-        
+
         Args:
             ocr_result: OCR stage results
             normalization_result: Normalization stage results
             classification_result: Classification stage results
             original_text: Original input text
-            
+
         Returns:
             Final ProcessingResponse
         """
         try:
-            # Detect final currency
-            currency, currency_confidence = currency_detector.detect_currency(original_text)
-            final_currency = currency.value if currency.value != "UNKNOWN" else ocr_result.currency_hint
+            # Reuse the currency detected during extraction; only rescan when
+            # the OCR stage did not record one
+            if ocr_result.currency is not None:
+                currency_value = ocr_result.currency
+            else:
+                currency, _currency_confidence = currency_detector.detect_currency(original_text)
+                currency_value = currency.value
+            final_currency = currency_value if currency_value != "UNKNOWN" else ocr_result.currency_hint
             
             # Calculate overall confidence
             confidences = [
@@ -1,8 +1,38 @@
 import re
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from models.data_models import Currency
 from config.settings import settings
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional fast path
+    ahocorasick = None
+
+# Literal expansions of CURRENCY_PATTERNS, grouped by the pattern they came
+# from. The regexes carry no word boundaries, so plain substring matching is
+# semantically equivalent and a single Aho-Corasick pass can replace the
+# per-currency regex sweeps.
+_CURRENCY_LITERALS: Dict[str, Dict[str, List[str]]] = {
+    "INR": {"INR": ["inr"], "Rs": ["rs.", "rs"], "₹": ["₹"], "Rupees": ["rupees", "rupee"]},
+    "USD": {"USD": ["usd"], "$": ["$"], "Dollars": ["dollars", "dollar"]},
+    "EUR": {"EUR": ["eur"], "€": ["€"], "Euros": ["euros", "euro"]},
+    "GBP": {"GBP": ["gbp"], "£": ["£"], "Pounds": ["pounds", "pound"]},
+}
+
+def _build_currency_automaton():
+    """Build one automaton over all currency literals (None if unavailable)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for currency, pattern_groups in _CURRENCY_LITERALS.items():
+        for pattern_key, literals in pattern_groups.items():
+            for literal in literals:
+                automaton.add_word(literal, (currency, pattern_key, literal))
+    automaton.make_automaton()
+    return automaton
+
+_CURRENCY_AUTOMATON = _build_currency_automaton()
+
 class CurrencyDetector:
     """Utility class for detecting and handling currencies."""
     
@@ -10,11 +40,11 @@ class CurrencyDetector:
         self.currency_patterns = self._compile_patterns()
     
     def _compile_patterns(self) -> dict:
-        """Compile regex patterns for each currency."""
-        compiled = {}
-        for currency, patterns in settings.CURRENCY_PATTERNS.items():
-            compiled[currency] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
-        return compiled
+        """Get the pre-compiled regex patterns for each currency."""
+        return {
+            currency: settings.get_currency_pattern(currency)
+            for currency in settings.CURRENCY_PATTERNS
+        }
     
     def detect_currency(self, text: str) -> Tuple[Currency, float]:
         """
@@ -26,6 +56,9 @@ class CurrencyDetector:
         Returns:
             Tuple of (Currency, confidence_score)
         """
+        if _CURRENCY_AUTOMATON is not None:
+            return self._detect_currency_automaton(text)
+
         currency_scores = {}
         
         for currency, patterns in self.currency_patterns.items():
@@ -48,9 +81,66 @@ class CurrencyDetector:
         
         best_currency = max(currency_scores.items(), key=lambda x: x[1])
         confidence = min(1.0, best_currency[1])
-        
+
         return Currency(best_currency[0]), confidence
-    
+
+    def _detect_currency_automaton(self, text: str) -> Tuple[Currency, float]:
+        """
+        Single-pass currency detection over one Aho-Corasick automaton.
+
+        Scoring mirrors the regex path: 0.3 per match plus an early-position
+        bonus per source pattern, but the text is scanned exactly once
+        regardless of how many currencies are configured.
+        """
+        lowered = text.lower()
+        matches: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+
+        for end_index, (currency, pattern_key, literal) in _CURRENCY_AUTOMATON.iter(lowered):
+            start = end_index - len(literal) + 1
+            matches.setdefault((currency, pattern_key), []).append((start, end_index + 1))
+
+        # Score pattern groups separately and in configuration order so the
+        # result (including float accumulation and tie-breaks) is identical
+        # to the regex path: its patterns run independently, so 'euro'
+        # counts for both the EUR and the Euros patterns
+        currency_scores = {}
+        for currency, pattern_groups in _CURRENCY_LITERALS.items():
+            score = 0
+            for pattern_key in pattern_groups:
+                spans = matches.get((currency, pattern_key))
+                if not spans:
+                    continue
+                # Drop spans contained in a longer span of the same source
+                # pattern so 'rs' inside 'rs.' (or 'rupee' inside 'rupees')
+                # counts once, matching the greedy regex behaviour
+                spans.sort(key=lambda s: (s[0], -(s[1] - s[0])))
+                kept = 0
+                earliest = None
+                last_end = -1
+                for start, end in spans:
+                    if end <= last_end:
+                        continue
+                    kept += 1
+                    if earliest is None:
+                        earliest = start
+                    last_end = end
+
+                score += kept * 0.3  # Weight per match
+
+                # Bonus for early occurrence
+                score += max(0, 1 - (earliest / len(text))) * 0.2
+
+            if score > 0:
+                currency_scores[currency] = score
+
+        if not currency_scores:
+            return Currency.UNKNOWN, 0.0
+
+        best_currency = max(currency_scores.items(), key=lambda x: x[1])
+        confidence = min(1.0, best_currency[1])
+
+        return Currency(best_currency[0]), confidence
+
     def extract_currency_context(self, text: str, currency: Currency) -> List[str]:
         """
         Extract text contexts where currency symbols appear.
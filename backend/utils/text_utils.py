@@ -1,7 +1,58 @@
 import re
+from functools import lru_cache
 from typing import List, Tuple, Optional
 from config.settings import settings
 
+# Compiled once at module scope; finditer callers skip the re cache lookup per call
+_PCT_RE = re.compile(r'\d+(?:\.\d+)?%')
+
+# One word pattern per correctable OCR character, compiled once for the
+# sequential correction passes
+_CORRECTABLE_WORD_RES = {
+    wrong_char: re.compile(r'\b\w*' + re.escape(wrong_char) + r'\w*\b')
+    for wrong_char in settings.OCR_DIGIT_CORRECTIONS
+}
+
+# Character-class check to skip digit correction entirely on clean input
+_OCR_BAD_CHARS = frozenset(settings.OCR_DIGIT_CORRECTIONS)
+
+# Fused currency/number/percentage grammar so tokenization is a single linear
+# scan. Each named branch reproduces one of the original per-strategy patterns
+# verbatim: currency-attached amounts carry no word boundaries (as before),
+# while standalone numbers keep their \b guards so digits glued to words
+# ("650mg") never tokenize. The trailing (?!\s*Rs) / (?!%) guards keep plain
+# numbers from eating the start of a postfix-currency or percentage token, and
+# the cur2b branch stops before an "Rs" that itself prefixes another amount
+# ("1000 Rs. 200") so the following currency token is still found. Every
+# branch starts at the token itself, so match.start() is the token position.
+_TOKEN_RE = re.compile(
+    r'(?P<cur1>Rs\.?\s*\d+(?:\.\d+)?)'
+    r'|(?P<cur2>\d+(?:\.\d+)?\s*Rs(?!\.?\s*\d))'
+    r'|(?P<cur2b>\d+(?:\.\d+)?(?=\s*Rs\.?\s*\d))'
+    r'|(?P<cur3>₹\s*\d+(?:\.\d+)?)'
+    r'|(?P<cur4>\$\s*\d+(?:\.\d+)?)'
+    r'|(?P<pct>\d+(?:\.\d+)?%)'
+    r'|(?P<num1>\b\d{1,3}(?:,\d{3})*(?:\.\d{1,3})?\b(?!\s*Rs)(?!%))'
+    r'|(?P<num2>\b\d+(?:\.\d{1,3})?\b(?!\s*Rs)(?!%))',
+    re.IGNORECASE
+)
+
+# Currency branch names in the original per-pattern scan order (Rs-prefix,
+# number-then-Rs, ₹, $)
+_CURRENCY_GROUP_ORDER = ('cur1', 'cur2', 'cur2b', 'cur3', 'cur4')
+_CURRENCY_GROUPS = frozenset(_CURRENCY_GROUP_ORDER)
+
+# Anchored standalone-number shapes. The multi-scan version matched these
+# independently of the currency/percentage passes, so digits inside a
+# currency or percentage token also surfaced as plain-number matches; the
+# fused scan replays them with anchored probes at each embedded digit run.
+_NUM1_ANCHOR = re.compile(r'\b\d{1,3}(?:,\d{3})*(?:\.\d{1,3})?\b')
+_NUM2_ANCHOR = re.compile(r'\b\d+(?:\.\d{1,3})?\b')
+_CUR2_TAIL = re.compile(r'\s*Rs', re.IGNORECASE)
+# Unguarded postfix-currency shape as the standalone scan matched it
+_CUR2_SHAPE = re.compile(r'\d+(?:\.\d+)?\s*Rs', re.IGNORECASE)
+_FIRST_DIGIT = re.compile(r'\d')
+
 class TextProcessor:
     """Utility class for text processing and cleaning."""
     
@@ -13,13 +64,16 @@ class TextProcessor:
     def clean_text(self, text: str) -> str:
         """
         Clean and normalize input text.
-        
+
         Args:
             text: Raw input text
-            
+
         Returns:
             Cleaned text
         """
+        return _clean_text_cached(text)
+
+    def _clean_text_impl(self, text: str) -> str:
         # Remove extra whitespace
         cleaned = re.sub(r'\s+', ' ', text.strip())
         
@@ -43,54 +97,155 @@ class TextProcessor:
         Returns:
             List of tuples: (token, position, context)
         """
-        tokens = []
-        
-        # Use multiple strategies to find numeric content
-        
-        # Strategy 1: Find currency-related patterns
-        currency_patterns = [
-            r'Rs\.?\s*\d+(?:\.\d+)?',      # Rs.100, Rs 100
-            r'\d+(?:\.\d+)?\s*Rs',         # 100Rs, 100.50 Rs
-            r'₹\s*\d+(?:\.\d+)?',          # ₹100
-            r'\$\s*\d+(?:\.\d+)?',         # $100
-        ]
-        
-        for pattern in currency_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                token = match.group().strip()
-                position = match.start()
-                context = self._get_context(text, position, match.end())
-                tokens.append((token, position, context))
-        
-        # Strategy 2: Find standalone numbers
-        number_patterns = [
-            r'\b\d{1,3}(?:,\d{3})*(?:\.\d{1,3})?\b',  # 1,234.56
-            r'\b\d+(?:\.\d{1,3})?\b',                  # 123.45
-            r'(?<!\d)\.\d{1,3}\b',                     # .30
+        return list(_extract_numeric_tokens_cached(text))
+
+    def _extract_numeric_tokens_impl(self, text: str) -> Tuple[Tuple[str, int, str], ...]:
+        # Single fused pass: currency-attached amounts, standalone numbers,
+        # and percentages are all matched by one compiled grammar. Matches
+        # are bucketed by the branch that fired and emitted in the original
+        # strategy order (currency patterns, then numbers, then percentages),
+        # so the token list - and with it the position-group dedup below -
+        # comes out exactly as the multi-scan version produced it
+        currency_hits = {name: [] for name in _CURRENCY_GROUP_ORDER}
+        cur2_cands = []  # (start, end, token) candidates for the postfix-currency shape
+        pct_cands = []  # (start, end, token) candidates for the percentage shape
+        num1_cands = []  # (start, end, token) candidates for the grouped-number shape
+        num2_cands = []  # (start, end, token) candidates for the plain-number shape
+
+        def _collect_plain(digit_pos: int, limit: int) -> None:
+            # Replay the plain-number scan over digits the fused pass has
+            # already consumed (inside currency, percentage, or grouped-number
+            # tokens); matching runs against the full text so the boundary
+            # checks see the real neighbouring characters
+            for probed in _NUM2_ANCHOR.finditer(text, digit_pos):
+                if probed.start() >= limit:
+                    break
+                num2_cands.append((probed.start(), probed.end(), probed.group()))
+
+        def _collect_grouped(digit_pos: int, limit: int) -> int:
+            # Replay the grouped-number scan likewise; its word boundaries
+            # sit after commas and decimal points too, so it can match deep
+            # inside a consumed span ("421813.8" still yields "8")
+            extended = limit
+            for probed in _NUM1_ANCHOR.finditer(text, digit_pos):
+                if probed.start() >= limit:
+                    break
+                num1_cands.append((probed.start(), probed.end(), probed.group()))
+                extended = max(extended, probed.end())
+            return extended
+
+        def _collect_pct(digit_pos: int, limit: int) -> None:
+            # Replay the percentage scan over consumed digits ("Rs. 10%",
+            # "3,185.288%"); the match may run past the consumed span
+            for probed in _PCT_RE.finditer(text, digit_pos):
+                if probed.start() >= limit:
+                    break
+                pct_cands.append((probed.start(), probed.end(), probed.group()))
+
+        def _collect_cur2(digit_pos: int, limit: int) -> None:
+            # Replay the postfix-currency scan over digits a standalone
+            # number consumed ("356.0.3Rs" -> "0.3Rs")
+            for probed in _CUR2_SHAPE.finditer(text, digit_pos):
+                if probed.start() >= limit:
+                    break
+                cur2_cands.append((probed.start(), probed.end(), probed.group().strip()))
+
+        def _probe_numbers(digit_pos: int, digit_end: int) -> None:
+            # Replay the independent standalone-number scans over digits
+            # embedded in a currency/percentage token
+            _collect_plain(digit_pos, _collect_grouped(digit_pos, digit_end))
+
+        for match in _TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            start = match.start()
+            if kind in _CURRENCY_GROUPS:
+                if kind == 'cur2b':
+                    # Number whose trailing "Rs" also prefixes the next
+                    # amount; the token still includes the "Rs" but the scan
+                    # resumes before it
+                    end = _CUR2_TAIL.match(text, match.end()).end()
+                else:
+                    end = match.end()
+                if kind in ('cur2', 'cur2b'):
+                    # cur2b hits belong to the same source pattern as cur2
+                    cur2_cands.append((start, end, text[start:end].strip()))
+                else:
+                    currency_hits[kind].append((text[start:end].strip(), start, end))
+                digit = _FIRST_DIGIT.search(text, start, end)
+                if digit:
+                    if kind not in ('cur2', 'cur2b'):
+                        # The postfix-currency scan also matched digits inside
+                        # a prefix-currency token when an "Rs" follows them
+                        # ("Rs 100 Rs", "$ 450.75 Rs")
+                        tail = _CUR2_TAIL.match(text, match.end())
+                        if tail:
+                            cur2_cands.append(
+                                (digit.start(), tail.end(), text[digit.start():tail.end()].strip())
+                            )
+                    _collect_pct(digit.start(), end)
+                    _probe_numbers(digit.start(), end)
+            elif kind == 'pct':
+                pct_cands.append((start, match.end(), match.group()))
+                _probe_numbers(start, match.end() - 1)
+            elif kind == 'num1':
+                # The (?!\s*Rs)/(?!%) guards truncate a number that runs into
+                # a postfix-currency or percentage token ("1,200 Rs" -> "1");
+                # the original scan had no such guards, so record the full
+                # anchored shape and replay the other scans over its span
+                full = _NUM1_ANCHOR.match(text, start)
+                num1_cands.append((start, full.end(), full.group()))
+                _collect_plain(start, full.end())
+                _collect_pct(start, full.end())
+                _collect_cur2(start, full.end())
+            else:
+                full = _NUM2_ANCHOR.match(text, start)
+                num2_cands.append((start, full.end(), full.group()))
+                _collect_grouped(start, full.end())
+                _collect_pct(start, full.end())
+                _collect_cur2(start, full.end())
+
+        # Per-shape scans were non-overlapping, so drop candidates starting
+        # inside an earlier kept match of the same shape (numbers shadowed
+        # out of one shape are still covered by the other shape's replay)
+        def _select(cands):
+            cands.sort(key=lambda cand: cand[0])
+            kept = []
+            last_end = -1
+            for cand in cands:
+                if cand[0] < last_end:
+                    continue
+                kept.append(cand)
+                last_end = cand[1]
+            return kept
+
+        kept_num1 = _select(num1_cands)
+        kept_num2 = _select(num2_cands)
+        kept_pct = _select(pct_cands)
+        currency_hits['cur2'] = [
+            (token, start, end) for start, end, token in _select(cur2_cands)
         ]
-        
-        for pattern in number_patterns:
-            for match in re.finditer(pattern, text):
-                token = match.group().strip()
-                # Skip very small numbers that are likely not amounts
-                if len(token) > 0:
-                    try:
-                        value = float(token.replace(',', '') if not token.startswith('.') else '0' + token.replace(',', ''))
-                        if value >= 1.0:  # Only consider numbers >= 1
-                            position = match.start()
-                            context = self._get_context(text, position, match.end())
-                            tokens.append((token, position, context))
-                    except ValueError:
-                        continue
-        
-        # Strategy 3: Look for percentage values
-        percentage_pattern = r'\d+(?:\.\d+)?%'
-        for match in re.finditer(percentage_pattern, text):
-            token = match.group().strip()
-            position = match.start()
-            context = self._get_context(text, position, match.end())
-            tokens.append((token, position, context))
-        
+
+        tokens = []
+
+        # Currency-related tokens (Rs.100, ₹100, 100Rs, ...)
+        for group_name in _CURRENCY_GROUP_ORDER:
+            for token, start, end in currency_hits[group_name]:
+                tokens.append((token, start, self._get_context(text, start, end)))
+
+        # Standalone numbers - skip very small values that are likely not amounts
+        for number_hits in (kept_num1, kept_num2):
+            for start, end, token in number_hits:
+                try:
+                    value = float(token.replace(',', ''))
+                except ValueError:
+                    continue
+                if value >= 1.0:  # Only consider numbers >= 1
+                    tokens.append((token, start, self._get_context(text, start, end)))
+
+        # Percentage tokens (10%, 5.5%)
+        for start, end, token in kept_pct:
+            tokens.append((token, start, self._get_context(text, start, end)))
+
         # Remove duplicates by position, preferring longer/more specific tokens
         unique_tokens = []
         position_groups = {}
@@ -117,8 +272,8 @@ class TextProcessor:
                     # Among plain numbers, prefer the longest
                     best_token = max(group_tokens, key=lambda x: len(x[0]))
                     unique_tokens.append(best_token)
-        
-        return unique_tokens
+
+        return tuple(unique_tokens)
     
     def _get_context(self, text: str, start: int, end: int, window: int = 20) -> str:
         """Get context around a text position."""
@@ -136,40 +291,51 @@ class TextProcessor:
         Returns:
             Tuple of (corrected_text, list_of_corrections_made)
         """
+        corrected, corrections = _correct_ocr_digits_cached(text)
+        # Callers append to the corrections list, so hand out a fresh copy
+        return corrected, list(corrections)
+
+    def _correct_ocr_digits_impl(self, text: str) -> Tuple[str, Tuple[str, ...]]:
         corrected = text
         corrections = []
-        
-        # First pass: correct obvious currency amount patterns
-        currency_patterns = [
-            # Handle patterns like Rs.150@ where @ represents 00
-            (r'Rs\.(\d+)[@]+', lambda m: f"Rs.{m.group(1)}00"),
-            # Handle patterns like Rs.1¢0, Rs.8@0, etc.
-            (r'Rs\.([lIoOsSbBgGzZ¢@ec]\d+)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
-            (r'Rs\.(\d*[lIoOsSbBgGzZ¢@ec]+\d*)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
-            (r'Rs\.(\d+[lIoOsSbBgGzZ¢@ec]+)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
-            # Same for ₹ symbol
-            (r'₹(\d+)[@]+', lambda m: f"₹{m.group(1)}00"),
-            (r'₹([lIoOsSbBgGzZ¢@ec]\d+)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
-            (r'₹(\d*[lIoOsSbBgGzZ¢@ec]+\d*)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
-            (r'₹(\d+[lIoOsSbBgGzZ¢@ec]+)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
-        ]
-        
-        for pattern, replacement in currency_patterns:
-            matches = list(re.finditer(pattern, corrected))
-            for match in reversed(matches):  # Process from end to avoid index issues
-                original = match.group()
-                new_value = replacement(match)
-                if original != new_value:
-                    corrected = corrected[:match.start()] + new_value + corrected[match.end():]
-                    corrections.append(f"Currency amount: '{original}' -> '{new_value}'")
-        
-        # Second pass: general digit corrections in numeric contexts (do this BEFORE word corrections)
-        for wrong_char, correct_char in self.digit_correction_map.items():
-            if wrong_char in corrected:
-                # Only correct if it's in a numeric context
-                pattern = rf'\b\w*{re.escape(wrong_char)}\w*\b'
+
+        # Skip the correction passes entirely when no correctable character is
+        # present (the common case for clean Tesseract output) - isdisjoint
+        # scans the string at C level
+        if not _OCR_BAD_CHARS.isdisjoint(text):
+            # First pass: correct obvious currency amount patterns
+            currency_patterns = [
+                # Handle patterns like Rs.150@ where @ represents 00
+                (r'Rs\.(\d+)[@]+', lambda m: f"Rs.{m.group(1)}00"),
+                # Handle patterns like Rs.1¢0, Rs.8@0, etc.
+                (r'Rs\.([lIoOsSbBgGzZ¢@ec]\d+)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
+                (r'Rs\.(\d*[lIoOsSbBgGzZ¢@ec]+\d*)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
+                (r'Rs\.(\d+[lIoOsSbBgGzZ¢@ec]+)', lambda m: f"Rs.{self._correct_amount_string(m.group(1))}"),
+                # Same for ₹ symbol
+                (r'₹(\d+)[@]+', lambda m: f"₹{m.group(1)}00"),
+                (r'₹([lIoOsSbBgGzZ¢@ec]\d+)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
+                (r'₹(\d*[lIoOsSbBgGzZ¢@ec]+\d*)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
+                (r'₹(\d+[lIoOsSbBgGzZ¢@ec]+)', lambda m: f"₹{self._correct_amount_string(m.group(1))}"),
+            ]
+
+            for pattern, replacement in currency_patterns:
                 matches = list(re.finditer(pattern, corrected))
-                
+                for match in reversed(matches):  # Process from end to avoid index issues
+                    original = match.group()
+                    new_value = replacement(match)
+                    if original != new_value:
+                        corrected = corrected[:match.start()] + new_value + corrected[match.end():]
+                        corrections.append(f"Currency amount: '{original}' -> '{new_value}'")
+
+            # Second pass: general digit corrections in numeric contexts (do this BEFORE word corrections)
+            # One mapping at a time over the evolving text: whether a word
+            # still looks numeric is re-checked between passes, so an early
+            # correction can stop later ones ("years" -> "year5", not "y0ar5")
+            for wrong_char, correct_char in self.digit_correction_map.items():
+                if wrong_char not in corrected:
+                    continue
+                matches = list(_CORRECTABLE_WORD_RES[wrong_char].finditer(corrected))
+
                 # Process matches in reverse order to avoid index issues
                 for match in reversed(matches):
                     word = match.group()
@@ -201,15 +367,12 @@ class TextProcessor:
                 corrected = re.sub(pattern, replacement, corrected)
                 if old_text != corrected:
                     corrections.append(f"Word correction: '{pattern}' -> '{replacement}'")
-        
-        return corrected, corrections
+
+        return corrected, tuple(corrections)
     
     def _correct_amount_string(self, amount_str: str) -> str:
         """Correct OCR errors in an amount string"""
-        corrected = amount_str
-        for wrong_char, correct_char in self.digit_correction_map.items():
-            corrected = corrected.replace(wrong_char, correct_char)
-        return corrected
+        return amount_str.translate(settings.OCR_TRANSLATION_TABLE)
     
     def _looks_numeric(self, word: str) -> bool:
         """
@@ -340,4 +503,20 @@ class TextProcessor:
         return text[start:end].strip()
 
 # Global text processor instance
-text_processor = TextProcessor()
\ No newline at end of file
+text_processor = TextProcessor()
+
+# Memoized entry points keyed on the input text. The processor is stateless,
+# so repeated pipeline stages working on the same document hit the cache
+# instead of re-running the regex passes. Cached values are immutable
+# (strings/tuples); the public methods copy before returning.
+@lru_cache(maxsize=2048)
+def _clean_text_cached(text: str) -> str:
+    return text_processor._clean_text_impl(text)
+
+@lru_cache(maxsize=2048)
+def _correct_ocr_digits_cached(text: str) -> Tuple[str, Tuple[str, ...]]:
+    return text_processor._correct_ocr_digits_impl(text)
+
+@lru_cache(maxsize=2048)
+def _extract_numeric_tokens_cached(text: str) -> Tuple[Tuple[str, int, str], ...]:
+    return text_processor._extract_numeric_tokens_impl(text)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import re
 from config.settings import settings
 
@@ -31,12 +31,12 @@ class ValidationUtils:
         return True, None
     
     @staticmethod
-    def validate_image_data(image_data: bytes, filename: Optional[str] = None) -> tuple[bool, Optional[str]]:
+    def validate_image_data(image_data: Union[bytes, memoryview], filename: Optional[str] = None) -> tuple[bool, Optional[str]]:
         """
         Validate image data for processing.
-        
+
         Args:
-            image_data: Image bytes
+            image_data: Image bytes (or any buffer-protocol object, e.g. memoryview/mmap)
             filename: Optional filename for format validation
             
         Returns:
@@ -60,7 +60,9 @@ class ValidationUtils:
             b'MM\x00*',  # TIFF (Motorola)
         ]
         
-        has_valid_signature = any(image_data.startswith(sig) for sig in image_signatures)
+        # Only the header is materialized, so memoryview/mmap inputs stay zero-copy
+        header = bytes(image_data[:8])
+        has_valid_signature = any(header.startswith(sig) for sig in image_signatures)
         if not has_valid_signature:
             return False, "Invalid image format. Supported formats: JPEG, PNG, BMP, TIFF"
         